@@ -48,15 +48,30 @@ def _json_default(o: Any) -> str:
         return "<unserializable>"
 
 
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+
 def append_jsonl(path: Path, obj: dict[str, Any]) -> None:
     """
     Best-effort append one JSON line. Never raises.
+
+    The line goes out as a single O_APPEND `write` on a raw fd (no text-layer buffering), so concurrent hook
+    processes appending to the same log do not interleave partial lines. The parent dir is only created when
+    the open fails for lack of it (`ensure_audit_paths` normally made it already).
     """
     try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        line = json.dumps(obj, ensure_ascii=False, default=_json_default)
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        data = (json.dumps(obj, ensure_ascii=False, default=_json_default) + "\n").encode("utf-8")
+        try:
+            fd = os.open(path, _APPEND_FLAGS, 0o666)
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(path, _APPEND_FLAGS, 0o666)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
     except Exception:
         return
 
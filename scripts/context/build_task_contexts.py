@@ -43,7 +43,7 @@ from lib.session import resolve_session_dir  # noqa: E402
 
 
 
-CODE_OWNERS = {"implementor", "tests-builder"}
+CODE_OWNERS = frozenset({"implementor", "tests-builder"})
 DOCS_KEEPER_TASK_ID = "docs-keeper"
 
 
@@ -12,18 +12,25 @@ Updated: 2026-02-02
 from __future__ import annotations
 
 import argparse
+import functools
+import io
 import json
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 
 PLUGIN_ROOT = Path(__file__).resolve().parents[2]
 
 
+# Both are run-constant; cached so repeated calls skip the clock/manifest read (tests may `cache_clear()`).
+@functools.lru_cache(maxsize=1)
 def _utc_date() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
 
+@functools.lru_cache(maxsize=1)
 def _load_plugin_version() -> str:
     manifest = PLUGIN_ROOT / "plugin.json"
     if manifest.exists():
@@ -44,109 +51,155 @@ def _load_plugin_version() -> str:
 
 
 
-def _iter_python_files(*, include_templates: bool) -> list[Path]:
-    out: list[Path] = []
-    for p in (PLUGIN_ROOT / "scripts").rglob("*.py"):
-        if p.name == "__init__.py":
+_HEADER_SCAN_CHARS = 4096
+
+_FM_KEY_RE = re.compile(r"(?m)^([A-Za-z_][A-Za-z0-9_-]*):\s*")
+
+_PRUNE_DIRS = {".git", "node_modules", "__pycache__", ".venv"}
+
+
+def _scan_tree(root: Path, *, wants_py: bool, wants_md: bool, skip_init: bool = True) -> tuple[list[str], list[str]]:
+    """
+    Walk `root` once and classify candidates by name:
+    - `*.py` (optionally excluding `__init__.py`)
+    - frontmatter markdown candidates: `SKILL.md` under a `skills/` tree, or `*.md` directly in `root` when it is
+      an `agents/` dir (nested dirs are not agent dirs)
+
+    Uses `os.scandir` so file/dir checks reuse the cached `DirEntry` type instead of a `stat()` per path.
+    """
+    py: list[str] = []
+    md: list[str] = []
+    if not root.is_dir():
+        return py, md
+    root_s = str(root)
+    root_is_agents = root.name == "agents"
+    stack: list[tuple[str, bool]] = [(root_s, "skills" in root.relative_to(PLUGIN_ROOT).parts)]
+    while stack:
+        dirpath, in_skills = stack.pop()
+        in_agents = root_is_agents and dirpath == root_s
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in _PRUNE_DIRS:
+                            stack.append((entry.path, in_skills or name == "skills"))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    if wants_py and name.endswith(".py"):
+                        if skip_init and name == "__init__.py":
+                            continue
+                        py.append(entry.path)
+                    elif wants_md and name.endswith(".md"):
+                        if (name == "SKILL.md" and in_skills) or in_agents:
+                            md.append(entry.path)
+        except OSError:
             continue
-        out.append(p)
+    return py, md
+
+
+def _starts_with_frontmatter(path: str) -> bool:
+    try:
+        with open(path, "rb") as fh:
+            return fh.read(4) == b"---\n"
+    except OSError:
+        return False
+
+
+def _discover_files(*, include_templates: bool, wants_py: bool, wants_md: bool) -> tuple[list[Path], list[Path]]:
+    # Walks are rooted at the already-resolved PLUGIN_ROOT, so plain path strings dedupe overlapping trees.
+    py: set[str] = set()
+    candidates: set[str] = set()
+
+    def _merge(found: tuple[list[str], list[str]]) -> None:
+        py.update(found[0])
+        candidates.update(found[1])
+
+    if wants_py:
+        _merge(_scan_tree(PLUGIN_ROOT / "scripts", wants_py=True, wants_md=False))
+    if wants_md:
+        # Plugin agents/skills.
+        _merge(_scan_tree(PLUGIN_ROOT / "agents", wants_py=False, wants_md=True))
+        _merge(_scan_tree(PLUGIN_ROOT / "skills", wants_py=False, wants_md=True))
+        # Repo-local project overlay (this repo uses it for the docs keeper system).
+        _merge(_scan_tree(PLUGIN_ROOT / ".claude" / "agents", wants_py=False, wants_md=True))
+        _merge(_scan_tree(PLUGIN_ROOT / ".claude" / "skills", wants_py=False, wants_md=True))
     if include_templates:
+        # Templates that get installed into projects should stay version-aligned too. Python is stamped across
+        # all templates; frontmatter markdown only in the installed agent/skill trees.
         templates = PLUGIN_ROOT / "templates"
-        if templates.exists():
-            for p in templates.rglob("*.py"):
-                out.append(p)
-    return sorted({p.resolve() for p in out})
-
-
-def _iter_frontmatter_md_files(*, include_templates: bool) -> list[Path]:
-    candidates: list[Path] = []
-
-    # Plugin agents/skills
-    for p in (PLUGIN_ROOT / "agents").glob("*.md"):
-        if p.is_file():
-            candidates.append(p)
-    for p in (PLUGIN_ROOT / "skills").rglob("SKILL.md"):
-        if p.is_file():
-            candidates.append(p)
-
-    # Repo-local project overlay (this repo uses it for the docs keeper system).
-    for p in (PLUGIN_ROOT / ".claude" / "agents").glob("*.md"):
-        if p.is_file():
-            candidates.append(p)
-    for p in (PLUGIN_ROOT / ".claude" / "skills").rglob("SKILL.md"):
-        if p.is_file():
-            candidates.append(p)
+        if wants_py:
+            _merge(_scan_tree(templates, wants_py=True, wants_md=False, skip_init=False))
+        if wants_md:
+            _merge(_scan_tree(templates / "claude" / "agents", wants_py=False, wants_md=True))
+            _merge(_scan_tree(templates / "claude" / "skills", wants_py=False, wants_md=True))
 
-    if include_templates:
-        # Templates that get installed into projects should stay version-aligned too.
-        for p in (PLUGIN_ROOT / "templates" / "claude" / "agents").glob("*.md"):
-            if p.is_file():
-                candidates.append(p)
-        for p in (PLUGIN_ROOT / "templates" / "claude" / "skills").rglob("SKILL.md"):
-            if p.is_file():
-                candidates.append(p)
-
-    # Keep only files that actually have frontmatter.
-    out: list[Path] = []
-    for p in candidates:
-        try:
-            if p.read_text(encoding="utf-8").startswith("---\n"):
-                out.append(p)
-        except Exception:
-            continue
-    return sorted({p.resolve() for p in out})
+    # Keep only markdown files that actually have frontmatter (Path objects only for survivors).
+    md = [Path(raw) for raw in sorted(candidates) if _starts_with_frontmatter(raw)]
+    return [Path(p) for p in sorted(py)], md
 
 
-def _find_header_docstring_span(lines: list[str]) -> tuple[int, int] | None:
+def _find_header_docstring_span(content: str) -> tuple[int, int] | None:
     """
     Return (start_idx, end_idx) inclusive indices for the first top-of-file docstring block.
-    Only considers a docstring that begins within the first ~30 lines.
+    Only considers a docstring that begins within the first ~30 lines (reads at most ~110 lines).
     """
     start = None
-    for i, line in enumerate(lines[:30]):
-        if line.strip().startswith('"""'):
+    for i, line in enumerate(io.StringIO(content)):
+        if start is None:
+            if i >= 30:
+                return None
+            stripped = line.strip()
+            if not stripped.startswith('"""'):
+                continue
             start = i
+            # Same-line docstring """..."""
+            if stripped.count('"""') >= 2 and stripped.endswith('"""'):
+                return (start, start)
+            continue
+        if i - start >= 80:
             break
-    if start is None:
-        return None
-    # Same-line docstring """..."""
-    if lines[start].strip().count('"""') >= 2 and lines[start].strip().endswith('"""'):
-        return (start, start)
-    for j in range(start + 1, min(len(lines), start + 80)):
-        if '"""' in lines[j]:
-            return (start, j)
+        if '"""' in line:
+            return (start, i)
     return None
 
 
 def _get_python_description(path: Path) -> str:
     # Keep it simple for v1: use current `at:` line if present; otherwise infer from filename.
     stem = path.stem.replace("_", " ")
-    if path.parts[-2:] == ("lib", path.name):
+    if path.parent.name == "lib":
         return f"Library module ({stem})"
     return f"Script ({stem})"
 
 
 def _update_python_header(path: Path, *, version: str, updated: str, dry_run: bool) -> bool:
     content = path.read_text(encoding="utf-8")
-    lines = content.splitlines()
 
-    # Detect our header docstring (only in the first ~40 lines).
-    head = "\n".join(lines[:40])
+    # Detect our header docstring (only in the first few KB, cut back to whole lines since the
+    # substitutions below are line-anchored).
+    head = content[:_HEADER_SCAN_CHARS]
+    head = head[: head.rfind("\n") + 1]
     if "at:" in head and "Version:" in head and "Updated:" in head:
         new_head = re.sub(r"^Version:\s*.*$", f"Version: {version}", head, flags=re.MULTILINE)
         new_head = re.sub(r"^Updated:\s*.*$", f"Updated: {updated}", new_head, flags=re.MULTILINE)
         if new_head != head:
-            new_content = new_head + "\n" + "\n".join(lines[len(head.splitlines()) :])
+            # `head` is a whole-line prefix of `content`, so splice the untouched tail back on.
+            new_content = new_head + content[len(head) :]
+            if not new_content.endswith("\n"):
+                new_content += "\n"
             if not dry_run:
-                path.write_text(new_content + ("\n" if not new_content.endswith("\n") else ""), encoding="utf-8")
+                path.write_bytes(new_content.encode("utf-8"))
             return True
         return False
 
     # If the file has a top-level docstring but doesn't match our header format, do not rewrite it.
     # (This keeps behavior predictable and avoids clobbering custom metadata.)
-    if _find_header_docstring_span(lines) is not None:
+    if _find_header_docstring_span(content) is not None:
         return False
 
+    lines = content.splitlines()
+
     description = _get_python_description(path)
     header_lines = [
         '"""',
@@ -164,67 +217,72 @@ def _update_python_header(path: Path, *, version: str, updated: str, dry_run: bo
         insert_at = 1
     # Keep a contiguous `# /// ... # ///` block together.
     if any(l.strip() == "# /// script" for l in lines[:15]):
+        # The block terminator is the last `# ///` in the window: scan backwards and stop at the first hit.
         end = None
-        for i in range(min(len(lines), 60)):
+        for i in range(min(len(lines), 60) - 1, -1, -1):
             if lines[i].strip() == "# ///":
                 end = i
+                break
         if end is not None:
             insert_at = end + 1
 
     new_lines = lines[:insert_at] + header_lines + lines[insert_at:]
     new_content = "\n".join(new_lines).rstrip() + "\n"
+    if new_content == content:
+        return False
     if not dry_run:
-        path.write_text(new_content, encoding="utf-8")
+        path.write_bytes(new_content.encode("utf-8"))
     return True
 
 
 def _update_md_frontmatter(path: Path, *, version: str, updated: str, dry_run: bool) -> bool:
-    content = path.read_text(encoding="utf-8")
-    if not content.startswith("---\n"):
+    # Work on bytes so only the (small) frontmatter block is decoded; the body is copied through as-is.
+    raw = path.read_bytes()
+    if not raw.startswith(b"---\n"):
         return False
-    end = content.find("\n---\n", 4)
+    end = raw.find(b"\n---\n", 4)
     if end == -1:
         return False
 
-    fm = content[4:end]
-    rest = content[end + 5 :]
+    fm = raw[4:end].decode("utf-8")
 
-    def _has(key: str) -> bool:
-        return re.search(rf"^{re.escape(key)}:\s*", fm, flags=re.MULTILINE) is not None
+    keys = set(_FM_KEY_RE.findall(fm))
+    has_version = "version" in keys
+    has_updated = "updated" in keys
 
     new_fm = fm
-    if _has("version"):
+    if has_version:
         new_fm = re.sub(r"^version:\s*.*$", f'version: "{version}"', new_fm, flags=re.MULTILINE)
-    if _has("updated"):
+    if has_updated:
         new_fm = re.sub(r"^updated:\s*.*$", f'updated: "{updated}"', new_fm, flags=re.MULTILINE)
 
-    if not _has("version") or not _has("updated"):
+    if not has_version or not has_updated:
         lines = new_fm.splitlines()
         out_lines: list[str] = []
         injected = False
         for line in lines:
             out_lines.append(line)
             if not injected and line.startswith("name:"):
-                if not _has("version"):
+                if not has_version:
                     out_lines.append(f'version: "{version}"')
-                if not _has("updated"):
+                if not has_updated:
                     out_lines.append(f'updated: "{updated}"')
                 injected = True
         if not injected:
             prefix: list[str] = []
-            if not _has("version"):
+            if not has_version:
                 prefix.append(f'version: "{version}"')
-            if not _has("updated"):
+            if not has_updated:
                 prefix.append(f'updated: "{updated}"')
             out_lines = prefix + out_lines
         new_fm = "\n".join(out_lines)
 
-    new_content = "---\n" + new_fm.strip("\n") + "\n---\n" + rest
-    if new_content != content:
-        if not dry_run:
-            path.write_text(new_content, encoding="utf-8")
-        return True
-    return False
+    new_fm_bytes = new_fm.strip("\n").encode("utf-8")
+    if new_fm_bytes == raw[4:end]:
+        return False
+    if not dry_run:
+        path.write_bytes(b"---\n" + new_fm_bytes + b"\n---\n" + raw[end + 5 :])
+    return True
 
 
 def main() -> int:
@@ -238,16 +296,26 @@ def main() -> int:
     version = _load_plugin_version()
     updated = _utc_date()
 
+    py_files, md_files = _discover_files(
+        include_templates=bool(args.include_templates),
+        wants_py=not args.md_only,
+        wants_md=not args.python_only,
+    )
+
+    # Stamping is I/O-bound (read + optional rewrite per file), so a thread pool overlaps the syscalls.
     changed: list[Path] = []
-    if not args.md_only:
-        for p in _iter_python_files(include_templates=bool(args.include_templates)):
-            if _update_python_header(p, version=version, updated=updated, dry_run=args.dry_run):
-                changed.append(p)
-
-    if not args.python_only:
-        for p in _iter_frontmatter_md_files(include_templates=bool(args.include_templates)):
-            if _update_md_frontmatter(p, version=version, updated=updated, dry_run=args.dry_run):
-                changed.append(p)
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = {
+            ex.submit(_update_python_header, p, version=version, updated=updated, dry_run=args.dry_run): p for p in py_files
+        }
+        futures.update(
+            {ex.submit(_update_md_frontmatter, p, version=version, updated=updated, dry_run=args.dry_run): p for p in md_files}
+        )
+        for fut in as_completed(futures):
+            if fut.result():
+                changed.append(futures[fut])
+    changed.sort()
 
     if args.dry_run:
         print(f"[DRY RUN] Would update {len(changed)} files:")
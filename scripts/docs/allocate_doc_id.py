@@ -14,7 +14,7 @@ Allocates the next available numeric ID for a given registry doc type prefix, e.
 
 This script is intentionally deterministic and project/language agnostic:
 - reads docs/DOCUMENTATION_REGISTRY.json (v2) to find doc_types prefix + dir
-- scans registry docs[] and the managed doc dir for existing numeric IDs
+- scans registry docs[] for existing numeric IDs (plus the managed doc dir with --strict-scan)
 
 Version: 0.5.0
 Updated: 2026-02-02
@@ -29,24 +29,25 @@ from pathlib import Path
 from typing import Any
 
 SCRIPT_ROOT = Path(__file__).resolve().parents[1]
-sys.path.insert(0, str(SCRIPT_ROOT))
+if str(SCRIPT_ROOT) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_ROOT))
 
-from lib.docs_registry import get_docs_registry_path, load_docs_registry  # noqa: E402
-from lib.path_policy import normalize_repo_relative_posix_path, resolve_path_under_project_root  # noqa: E402
-from lib.project import detect_project_dir, load_project_config  # noqa: E402
+# `lib.*` imports are deferred to call sites so `--help` (and importing this module) stays cheap.
 
 
-def _get_doc_type(registry: dict[str, Any], doc_type: str) -> dict[str, Any] | None:
+def _index_doc_types(registry: dict[str, Any]) -> dict[str, dict[str, Any]]:
     dts = registry.get("doc_types")
     if not isinstance(dts, list):
-        return None
+        return {}
+    index: dict[str, dict[str, Any]] = {}
     for it in dts[:200]:
         if not isinstance(it, dict):
             continue
         t = it.get("type")
-        if isinstance(t, str) and t.strip() == doc_type:
-            return it
-    return None
+        if isinstance(t, str) and t.strip():
+            # First entry wins (matches the previous linear scan).
+            index.setdefault(t.strip(), it)
+    return index
 
 
 def _collect_existing_numbers(
@@ -56,55 +57,47 @@ def _collect_existing_numbers(
     doc_type: str,
     prefix: str,
     managed_dir: str,
-) -> tuple[set[int], int]:
+    strict_scan: bool = False,
+) -> tuple[int, int]:
     """
-    Returns (numbers, width_guess).
-    width_guess is inferred from existing IDs, defaulting to 4.
+    Returns (max_num, width_guess).
+    max_num is 0 when no IDs exist; width_guess is inferred from existing IDs, defaulting to 4.
     """
-    numbers: set[int] = set()
-    widths: list[int] = []
+    from lib.path_policy import normalize_repo_relative_posix_path, resolve_path_under_project_root
 
-    rx = re.compile(rf"^{re.escape(prefix)}(?P<num>\d+)$")
+    max_num = 0
+    max_width = 0
+
+    # One anchored multiline regex over a newline-joined blob of candidates (one findall, not N matches).
+    rx = re.compile(rf"(?m)^{re.escape(prefix)}(\d+)$")
+    candidates: list[str] = []
 
     docs = registry.get("docs")
     if isinstance(docs, list):
         for it in docs[:5000]:
-            if not isinstance(it, dict):
-                continue
-            if it.get("type") != doc_type:
+            if not isinstance(it, dict) or it.get("type") != doc_type:
                 continue
             did = it.get("id")
-            if not isinstance(did, str) or not did.strip():
-                continue
-            m = rx.match(did.strip())
-            if not m:
-                continue
-            raw = m.group("num")
-            try:
-                numbers.add(int(raw))
-                widths.append(len(raw))
-            except Exception:
-                continue
+            if isinstance(did, str) and did.strip():
+                candidates.append(did.strip())
 
-    dir_norm = normalize_repo_relative_posix_path(managed_dir)
+    # The v2 registry is authoritative; walking the managed dir is an opt-in defensive check.
+    dir_norm = normalize_repo_relative_posix_path(managed_dir) if strict_scan else ""
     if dir_norm:
         root = resolve_path_under_project_root(project_root, dir_norm)
         if root and root.exists() and root.is_dir():
-            for p in root.rglob("*.md"):
-                stem = p.stem
-                m = rx.match(stem)
-                if not m:
-                    continue
-                raw = m.group("num")
-                try:
-                    numbers.add(int(raw))
-                    widths.append(len(raw))
-                except Exception:
-                    continue
-
-    width_guess = max(widths) if widths else 4
+            candidates.extend(p.stem for p in root.rglob("*.md"))
+
+    for raw in rx.findall("\n".join(candidates)):
+        n = int(raw)
+        if n > max_num:
+            max_num = n
+        if len(raw) > max_width:
+            max_width = len(raw)
+
+    width_guess = max_width or 4
     width_guess = max(2, min(width_guess, 8))
-    return (numbers, width_guess)
+    return (max_num, width_guess)
 
 
 def main() -> int:
@@ -112,8 +105,16 @@ def main() -> int:
     parser.add_argument("--project-dir", default=None)
     parser.add_argument("--registry-path", default=None)
     parser.add_argument("--type", required=True, choices=["context", "architecture", "adr", "ard", "pattern", "runbook"])
+    parser.add_argument(
+        "--strict-scan",
+        action="store_true",
+        help="Also scan the managed doc dir for IDs not yet listed in the registry.",
+    )
     args = parser.parse_args()
 
+    from lib.docs_registry import get_docs_registry_path, load_docs_registry
+    from lib.project import detect_project_dir, load_project_config
+
     project_root = detect_project_dir(args.project_dir)
     cfg = load_project_config(project_root) or {}
     registry_path = args.registry_path or get_docs_registry_path(cfg)
@@ -126,7 +127,7 @@ def main() -> int:
         print(json.dumps({"ok": False, "error": f"unsupported registry.version: {registry.get('version')!r}"}))
         return 2
 
-    dt = _get_doc_type(registry, args.type)
+    dt = _index_doc_types(registry).get(args.type)
     if not isinstance(dt, dict):
         print(json.dumps({"ok": False, "error": f"doc type not found in registry.doc_types: {args.type!r}"}))
         return 2
@@ -143,14 +144,15 @@ def main() -> int:
     prefix = prefix.strip()
     managed_dir = managed_dir.strip()
 
-    numbers, width = _collect_existing_numbers(
+    max_num, width = _collect_existing_numbers(
         project_root,
         registry=registry,
         doc_type=args.type,
         prefix=prefix,
         managed_dir=managed_dir,
+        strict_scan=bool(args.strict_scan),
     )
-    next_num = (max(numbers) + 1) if numbers else 1
+    next_num = max_num + 1
 
     new_id = f"{prefix}{next_num:0{width}d}"
     suggested_path = f"{managed_dir.rstrip('/')}/{new_id}.md"
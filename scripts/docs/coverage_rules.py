@@ -24,14 +24,18 @@ Updated: 2026-02-02
 """
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
+import fnmatch
+import functools
+import itertools
+import json
 import re
-from typing import Any
+import sys
+from typing import Any, Callable
 
-from lib.docs_validation import match_globs
 
-
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RuleTrigger:
     rule_id: str
     matched_paths: list[str]
@@ -39,48 +43,108 @@ class RuleTrigger:
     matched_keywords: list[str]
 
 
-
-
-
-
-
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CoveragePlan:
     required_doc_ids: list[str]
     required_create_types: list[str]
     triggered: list[RuleTrigger]
 
 
-def _paths_by_action(changed_files: list[dict[str, Any]]) -> dict[str, list[str]]:
-    out: dict[str, list[str]] = {"created": [], "modified": [], "deleted": [], "any": []}
+ChangedPair = tuple[str, str | None]
+
+
+def _as_pairs(changed_files: list[Any]) -> list[ChangedPair]:
+    """
+    Convert changed files to normalized (path, action) tuples once at entry.
+    Items may be `{"path", "action"}` dicts (public shape) or `(path, action)` tuples; invalid items are skipped.
+    Non-string actions become None.
+    """
+    out: list[ChangedPair] = []
+    add = out.append
     for it in changed_files[:5000]:
-        if not isinstance(it, dict):
-            continue
-        p = it.get("path")
-        a = it.get("action")
+        if isinstance(it, tuple):
+            if len(it) != 2:
+                continue
+            p, a = it
+        else:
+            try:
+                p = it["path"]
+                a = it.get("action")
+            except (TypeError, KeyError, AttributeError):
+                continue
         if not isinstance(p, str) or not p.strip():
             continue
-        path = p.strip().replace("\\", "/")
-        out["any"].append(path)
-        if a in {"created", "modified", "deleted"}:
-            out[a].append(path)
+        add((p.strip().replace("\\", "/"), a if isinstance(a, str) else None))
     return out
 
 
-_KNOWN_CREATE_TYPES = {"context", "architecture", "adr", "ard", "pattern", "runbook"}
+def _paths_by_action(items: list[ChangedPair]) -> tuple[dict[str, list[str]], list[str | None]]:
+    """
+    Returns (buckets, any_actions): per-action path buckets plus the action of each `buckets["any"]` entry
+    (None for unknown actions), aligned by index.
+    """
+    any_: list[str] = []
+    any_actions: list[str | None] = []
+    by_action: dict[str, list[str]] = {"created": [], "modified": [], "deleted": []}
+    add_any = any_.append
+    add_action = any_actions.append
+    get_bucket = by_action.get
+    for path, a in items:
+        # `any` keeps input order and also carries paths with unknown actions.
+        add_any(path)
+        bucket = get_bucket(a) if a is not None else None
+        if bucket is not None:
+            bucket.append(path)
+            add_action(a)
+        else:
+            add_action(None)
+    return ({**by_action, "any": any_}, any_actions)
+
+
+_KNOWN_CREATE_TYPES = frozenset({"context", "architecture", "adr", "ard", "pattern", "runbook"})
+
+
+_WILDCARD_RE = re.compile(r"[*?\[\]]")
+
+
+def _glist(d: dict[str, Any], key: str) -> list[Any] | None:
+    v = d.get(key)
+    return v if isinstance(v, list) else None
 
 
-def _normalize_globs(globs: list[str]) -> list[str]:
+def _normalize_globs(globs: list[str]) -> tuple[str, ...]:
+    return _normalize_glob_tuple(tuple(g for g in globs[:500] if isinstance(g, str)))
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_glob_tuple(globs: tuple[str, ...]) -> tuple[str, ...]:
     out: list[str] = []
-    for g in globs[:500]:
-        if not isinstance(g, str) or not g.strip():
+    for g in globs:
+        if not g.strip():
             continue
         s = g.strip().replace("\\", "/")
         # Allow using "dir/" as a prefix shorthand (project-agnostic convenience).
-        if s.endswith("/") and not any(ch in s for ch in ["*", "?", "[", "]"]):
+        if s.endswith("/") and _WILDCARD_RE.search(s) is None:
             s = s + "**"
         out.append(s)
-    return out
+    return tuple(out)
+
+
+@functools.lru_cache(maxsize=4096)
+def _compiled_globset(globs: tuple[str, ...]) -> re.Pattern[str]:
+    """
+    One compiled alternation per distinct glob tuple (same semantics as `match_globs`).
+    Callers use `.match`, so each branch is anchored at both ends (`fnmatch.translate` appends `\\Z`).
+    Matching stays case-sensitive; `re.ASCII` only skips Unicode tables, since translated globs use no
+    `\\w`/`\\b` classes. `translate` emits backtrack-free groups for `*` runs, so patterns like
+    `a*a*a*b` stay linear.
+    """
+    return re.compile("|".join(f"(?:{fnmatch.translate(g)})" for g in globs), re.ASCII)
+
+
+def _dedup(items: list[str], limit: int) -> list[str]:
+    # Order-preserving dedup: buckets follow changed_files input order, so output stays deterministic.
+    return list(dict.fromkeys(items))[:limit]
 
 
 def _normalize_keywords(phrases: list[str]) -> list[str]:
@@ -97,6 +161,17 @@ def _normalize_keywords(phrases: list[str]) -> list[str]:
 _TOKEN_RE = re.compile(r"[a-z0-9]+")
 
 
+def _normalize_keywords_cached(raw: list[Any], cache: dict[tuple[str, ...], list[str]] | None) -> list[str]:
+    # Rules often repeat the same phrase lists; tokenize each distinct list once per evaluation.
+    key = tuple(x for x in raw if isinstance(x, str))
+    if cache is None:
+        return _normalize_keywords(list(key))
+    hit = cache.get(key)
+    if hit is None:
+        hit = cache[key] = _normalize_keywords(list(key))
+    return hit
+
+
 def _text_blob(keywords_text: str | None) -> str:
     if not isinstance(keywords_text, str) or not keywords_text.strip():
         return ""
@@ -107,89 +182,165 @@ def _text_blob(keywords_text: str | None) -> str:
     return " " + " ".join(tokens) + " "
 
 
-def _keywords_any_match(blob: str, phrases: list[str]) -> tuple[bool, list[str]]:
+@functools.lru_cache(maxsize=1024)
+def _phrases_matcher(phrases: tuple[str, ...]) -> tuple[re.Pattern[str], dict[str, tuple[str, ...]]]:
+    """
+    Compile one zero-width alternation that reports, at each token start, the longest phrase found there.
+    Shorter phrases starting at the same token are exactly the token-prefixes of that hit, so the second
+    value maps each phrase to the phrases it implies.
+    """
+    uniq = sorted({p for p in phrases if p}, key=lambda p: (-len(p), p))
+    pattern = re.compile("(?<= )(?=(" + "|".join(re.escape(p) for p in uniq) + ") )")
+    implied = {p: tuple(q for q in uniq if p == q or p.startswith(q + " ")) for p in uniq}
+    return (pattern, implied)
+
+
+def _phrases_found(blob: str, phrases: list[str]) -> set[str]:
+    pattern, implied = _phrases_matcher(tuple(phrases))
+    found: set[str] = set()
+    if not implied:
+        return found
+    for hit in set(pattern.findall(blob)):
+        found.update(implied[hit])
+    return found
+
+
+def _keywords_any_match(blob: str, phrases: list[str], found: set[str] | None = None) -> tuple[bool, list[str]]:
     if not blob or not phrases:
         return (False, [])
+    if found is None:
+        found = _phrases_found(blob, phrases[:500])
     matched: list[str] = []
     for p in phrases[:500]:
-        if not p:
-            continue
-        if f" {p} " in blob:
+        if p in found:
             matched.append(p)
-    return (len(matched) > 0, matched[:20])
+            if len(matched) >= 20:
+                break
+    return (len(matched) > 0, matched)
 
 
-def _keywords_all_match(blob: str, phrases: list[str]) -> tuple[bool, list[str]]:
+def _keywords_all_match(blob: str, phrases: list[str], found: set[str] | None = None) -> tuple[bool, list[str]]:
     if not phrases:
         return (True, [])
     if not blob:
         return (False, [])
-    missing: list[str] = []
-    for p in phrases[:500]:
-        if not p:
-            continue
-        if f" {p} " not in blob:
-            missing.append(p)
-    return (len(missing) == 0, [])
+    if found is None:
+        found = _phrases_found(blob, phrases[:500])
+    return (all(p in found for p in phrases[:500] if p), [])
 
 
-def _eval_match_group(group: dict[str, Any], *, paths: dict[str, list[str]], blob: str) -> tuple[bool, list[str], list[str]]:
-    """
-    Returns: (matched, matched_paths, matched_keywords)
-    A group matches if all specified predicates match (AND).
-    """
-    matched_paths: list[str] = []
-    matched_keywords: list[str] = []
+_GROUP_PATH_BUCKETS = (
+    ("paths_any", "any"),
+    ("changed_paths_any", "any"),
+    ("created_paths_any", "created"),
+    ("modified_paths_any", "modified"),
+    ("deleted_paths_any", "deleted"),
+)
+
+
+_PathMatch = Callable[[str], Any]
+
 
+@dataclass(frozen=True, slots=True)
+class _GroupSpec:
+    """One `match_any` group with its predicates pre-normalized (globs compiled, keyword lists tokenized)."""
+
+    always: bool
+    path_preds: tuple[tuple[str, _PathMatch], ...]
+    kw_any: tuple[str, ...] | None
+    kw_all: tuple[str, ...]
+
+
+_ALWAYS_GROUP = _GroupSpec(always=True, path_preds=(), kw_any=None, kw_all=())
+
+
+def _compile_group(group: dict[str, Any], kw_cache: dict[tuple[str, ...], list[str]]) -> _GroupSpec | None:
+    """Returns None for groups that can never match (malformed or empty predicates)."""
     if group.get("always") is True:
-        return (True, [], [])
+        return _ALWAYS_GROUP
 
     # Paths predicates (globs against appropriate action buckets)
-    mapping = {
-        "paths_any": "any",
-        "changed_paths_any": "any",
-        "created_paths_any": "created",
-        "modified_paths_any": "modified",
-        "deleted_paths_any": "deleted",
-    }
-    for key, bucket in mapping.items():
+    path_preds: list[tuple[str, _PathMatch]] = []
+    for key, bucket in _GROUP_PATH_BUCKETS:
         globs = group.get(key)
         if globs is None:
             continue
         if not isinstance(globs, list):
-            return (False, [], [])
-        gs = _normalize_globs([str(g) for g in globs if isinstance(g, str)])
+            return None
+        gs = _normalize_globs(globs)
         if not gs:
-            return (False, [], [])
-        hits = [p for p in paths[bucket] if match_globs(p, gs)]
-        if not hits:
-            return (False, [], [])
-        matched_paths.extend(hits[:40])
+            return None
+        path_preds.append((bucket, _compiled_globset(gs).match))
 
-    # Keyword predicates (substring match against provided blob)
+    # Keyword predicates (phrase match against the provided blob)
+    kw_any: tuple[str, ...] | None = None
     kwa = group.get("keywords_any")
     if kwa is not None:
         if not isinstance(kwa, list):
-            return (False, [], [])
-        phrases = _normalize_keywords([str(x) for x in kwa if isinstance(x, str)])
-        ok, hits = _keywords_any_match(blob, phrases)
-        if not ok:
-            return (False, [], [])
-        matched_keywords.extend(hits)
+            return None
+        kw_any = tuple(_normalize_keywords_cached(kwa, kw_cache))
+        if not kw_any:
+            return None
 
+    kw_all: tuple[str, ...] = ()
     kwa_all = group.get("keywords_all")
     if kwa_all is not None:
         if not isinstance(kwa_all, list):
+            return None
+        # An empty normalized list is vacuously satisfied.
+        kw_all = tuple(_normalize_keywords_cached(kwa_all, kw_cache))
+
+    return _GroupSpec(always=False, path_preds=tuple(path_preds), kw_any=kw_any, kw_all=kw_all)
+
+
+def _match_group(
+    spec: _GroupSpec,
+    *,
+    paths: dict[str, tuple[str, ...]],
+    blob: str,
+    found_phrases: set[str] | None,
+) -> tuple[bool, list[str], list[str]]:
+    """
+    Returns: (matched, matched_paths, matched_keywords)
+    A group matches if all specified predicates match (AND).
+    `found_phrases` is the precomputed set of rule phrases present in `blob` (None when `blob` is empty).
+    """
+    if spec.always:
+        return (True, [], [])
+
+    # Cheap fast-fails first (predicates are ANDed): an empty bucket or empty blob rejects the group before
+    # any path filtering happens.
+    for bucket, _ in spec.path_preds:
+        if not paths[bucket]:
             return (False, [], [])
-        phrases = _normalize_keywords([str(x) for x in kwa_all if isinstance(x, str)])
-        ok, _ = _keywords_all_match(blob, phrases)
+    if not blob and (spec.kw_any is not None or spec.kw_all):
+        return (False, [], [])
+
+    matched_paths: list[str] = []
+    for bucket, match in spec.path_preds:
+        # `islice` stops the scan as soon as 40 hits are found.
+        hits = list(itertools.islice(filter(match, paths[bucket]), 40))
+        if not hits:
+            return (False, [], [])
+        matched_paths.extend(hits)
+
+    matched_keywords: list[str] = []
+    if spec.kw_any is not None:
+        ok, kw_hits = _keywords_any_match(blob, spec.kw_any, found_phrases)
+        if not ok:
+            return (False, [], [])
+        matched_keywords.extend(kw_hits)
+
+    if spec.kw_all:
+        ok, _ = _keywords_all_match(blob, spec.kw_all, found_phrases)
         if not ok:
             return (False, [], [])
 
-    return (True, sorted(set(matched_paths))[:40], sorted(set(matched_keywords))[:20])
+    return (True, _dedup(matched_paths, 40), _dedup(matched_keywords, 20))
 
 
 def _extract_required_from_requires(requires: Any) -> tuple[set[str], set[str]]:
+    # Ids/types are interned at ingest: they recur across rules and cached plans, so set ops hit identity first.
     req_docs: set[str] = set()
     req_types: set[str] = set()
     if not isinstance(requires, list):
@@ -198,123 +349,264 @@ def _extract_required_from_requires(requires: Any) -> tuple[set[str], set[str]]:
         if not isinstance(it, dict):
             continue
         did = it.get("id")
-        if isinstance(did, str) and did.strip():
-            req_docs.add(did.strip())
+        if isinstance(did, str) and (d := did.strip()):
+            req_docs.add(sys.intern(d))
         typ = it.get("type")
-        if isinstance(typ, str) and typ.strip() and typ.strip() in _KNOWN_CREATE_TYPES:
-            req_types.add(typ.strip())
+        if isinstance(typ, str) and (t := typ.strip()) in _KNOWN_CREATE_TYPES:
+            req_types.add(sys.intern(t))
     return (req_docs, req_types)
 
 
+_PLAN_CACHE: OrderedDict[tuple[int, int, int], CoveragePlan] = OrderedDict()
+_PLAN_CACHE_MAX = 128
+
+
+def clear_cache() -> None:
+    """Drop memoized plans (see `use_cache`)."""
+    _PLAN_CACHE.clear()
+
+
+@dataclass(frozen=True, slots=True)
+class _RuleSpec:
+    """
+    One rule with everything that does not depend on the inputs resolved: id, final note, compiled group
+    specs (advanced shape) or compiled glob matchers (legacy shape), and the docs/types it requires.
+    """
+
+    rule_id: str
+    note: str | None
+    groups: tuple[_GroupSpec, ...] | None
+    any_match: _PathMatch | None
+    action_match: dict[str, _PathMatch]
+    req_docs: frozenset[str]
+    req_types: frozenset[str]
+
+
+def _compile_rule(rule: dict[str, Any], kw_cache: dict[tuple[str, ...], list[str]]) -> _RuleSpec | None:
+    """Returns None for rules that can never trigger (no usable id, no matchable group/glob)."""
+    rid = rule.get("id")
+    if not isinstance(rid, str) or not rid.strip():
+        return None
+    rid_s = rid.strip()
+
+    note = rule.get("when")
+    if not isinstance(note, str) or not note.strip():
+        note = desc if isinstance(desc := rule.get("description"), str) else None
+
+    # Advanced rule shape: match_any groups + requires
+    match_any = rule.get("match_any")
+    if isinstance(match_any, list):
+        groups = tuple(
+            spec
+            for group in match_any[:50]
+            if isinstance(group, dict) and (spec := _compile_group(group, kw_cache)) is not None
+        )
+        if not groups:
+            return None
+        r_docs, r_types = _extract_required_from_requires(rule.get("requires"))
+        return _RuleSpec(
+            rule_id=rid_s,
+            note=note.strip() if isinstance(note, str) and note.strip() else None,
+            groups=groups,
+            any_match=None,
+            action_match={},
+            req_docs=frozenset(r_docs),
+            req_types=frozenset(r_types),
+        )
+
+    # Legacy rule shape: match + actions
+    match = rm if isinstance(rm := rule.get("match"), dict) else {}
+    actions = ra if isinstance(ra := rule.get("actions"), dict) else {}
+
+    any_globs = _normalize_globs(v) if (v := _glist(match, "paths_any")) else ()
+    created_globs = _normalize_globs(v) if (v := _glist(match, "created_paths_any")) else ()
+    modified_globs = _normalize_globs(v) if (v := _glist(match, "modified_paths_any")) else ()
+    deleted_globs = _normalize_globs(v) if (v := _glist(match, "deleted_paths_any")) else ()
+    any_match = _compiled_globset(any_globs).match if any_globs else None
+    action_match = {
+        a: _compiled_globset(gs).match
+        for a, gs in (("created", created_globs), ("modified", modified_globs), ("deleted", deleted_globs))
+        if gs
+    }
+    if any_match is None and not action_match:
+        return None
+
+    l_docs: set[str] = set()
+    doc_ids = actions.get("require_doc_ids")
+    if isinstance(doc_ids, list):
+        for d in doc_ids[:200]:
+            if isinstance(d, str) and (ds := d.strip()):
+                l_docs.add(sys.intern(ds))
+
+    l_types: set[str] = set()
+    create_types = actions.get("require_create_types")
+    if isinstance(create_types, list):
+        for t in create_types[:50]:
+            if isinstance(t, str) and (ts := t.strip()):
+                l_types.add(sys.intern(ts))
+
+    legacy_note = actions.get("note")
+    return _RuleSpec(
+        rule_id=rid_s,
+        note=legacy_note if isinstance(legacy_note, str) and legacy_note.strip() else (note if isinstance(note, str) else None),
+        groups=None,
+        any_match=any_match,
+        action_match=action_match,
+        req_docs=frozenset(l_docs),
+        req_types=frozenset(l_types),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledCoverageRules:
+    """
+    Rule-set work that does not depend on changed files or keyword text: priority order, per-rule compiled
+    predicates, the union of rule phrases, and the plan-cache token. Build once via `precompile_coverage_rules`
+    when evaluating the same rules many times.
+    """
+
+    rules: tuple[_RuleSpec, ...]
+    phrases: tuple[str, ...]
+    cache_token: int | None
+
+
+def _rules_token(rules: list[Any]) -> int | None:
+    # Plan-cache identity of a raw rule list (None when it is not JSON-serializable, i.e. uncacheable).
+    try:
+        return hash(json.dumps(rules, sort_keys=True))
+    except (TypeError, ValueError):
+        return None
+
+
+def _compile_rules(rules: list[Any], *, token: int | None) -> CompiledCoverageRules:
+    # Evaluate deterministically top-to-bottom by priority desc (advanced rules), else preserve input order.
+    # Decorate once (O(n)) so the sort compares plain int tuples; the input index breaks ties.
+    decorated: list[tuple[int, int, dict[str, Any]]] = []
+    for i, r in enumerate(rules):
+        if isinstance(r, dict):
+            pr = r.get("priority")
+            decorated.append((-pr if isinstance(pr, int) else 0, i, r))
+    decorated.sort(key=lambda t: (t[0], t[1]))
+
+    # Rules often repeat the same phrase lists; tokenize each distinct list once.
+    kw_cache: dict[tuple[str, ...], list[str]] = {}
+    specs = tuple(spec for _, _, r in decorated[:800] if (spec := _compile_rule(r, kw_cache)) is not None)
+
+    phrases: dict[str, None] = {}
+    for spec in specs:
+        for g in spec.groups or ():
+            phrases.update(dict.fromkeys(g.kw_any or ()))
+            phrases.update(dict.fromkeys(g.kw_all))
+
+    return CompiledCoverageRules(rules=specs, phrases=tuple(phrases), cache_token=token)
+
+
+def precompile_coverage_rules(rules: Any) -> CompiledCoverageRules:
+    """Precompute the rule-only part of evaluation; pass the result wherever `rules` is accepted."""
+    rules = rules if isinstance(rules, list) else []
+    return _compile_rules(rules, token=_rules_token(rules))
+
+
 def evaluate_coverage_rules(
     rules: Any,
     *,
-    changed_files: list[dict[str, Any]],
+    changed_files: list[dict[str, Any]] | list[tuple[str, str]],
     keywords_text: str | None = None,
+    use_cache: bool = False,
 ) -> CoveragePlan:
-    if not isinstance(rules, list) or not rules:
-        return CoveragePlan(required_doc_ids=[], required_create_types=[], triggered=[])
+    """
+    Evaluate coverage rules against changed files (+ optional keyword text).
 
-    paths = _paths_by_action(changed_files)
+    `rules` is the registry's coverage_rules list or a `CompiledCoverageRules` from `precompile_coverage_rules`.
+    `changed_files` items are `{"path", "action"}` dicts or `(path, action)` tuples.
+    With `use_cache=True`, identical inputs return the previously computed plan from a small in-process LRU;
+    callers must treat the returned plan as read-only.
+    """
+    empty = CoveragePlan(required_doc_ids=[], required_create_types=[], triggered=[])
+    if isinstance(rules, CompiledCoverageRules):
+        compiled: CompiledCoverageRules | None = rules
+        token = rules.cache_token
+    elif isinstance(rules, list) and rules:
+        compiled = None  # compiled lazily: a plan-cache hit needs only the token
+        token = _rules_token(rules) if use_cache else None
+    else:
+        return empty
+
+    pairs = _as_pairs(changed_files)
+    key = None
+    if use_cache and token is not None:
+        key = (token, hash(tuple(pairs)), hash(keywords_text or ""))
+        cached = _PLAN_CACHE.get(key)
+        if cached is not None:
+            _PLAN_CACHE.move_to_end(key)
+            return cached
+
+    if compiled is None:
+        compiled = _compile_rules(rules, token=token)
+    if not compiled.rules:
+        return empty
+    plan = _evaluate_coverage_rules(compiled, pairs=pairs, keywords_text=keywords_text)
+    if key is not None:
+        _PLAN_CACHE[key] = plan
+        if len(_PLAN_CACHE) > _PLAN_CACHE_MAX:
+            _PLAN_CACHE.popitem(last=False)
+    return plan
+
+
+def _evaluate_coverage_rules(
+    compiled: CompiledCoverageRules,
+    *,
+    pairs: list[ChangedPair],
+    keywords_text: str | None,
+) -> CoveragePlan:
+    # Freeze the action buckets once; every rule/group filters these same tuples.
+    buckets, any_actions = _paths_by_action(pairs)
+    paths = {k: tuple(v) for k, v in buckets.items()}
     blob = _text_blob(keywords_text)
     req_docs: set[str] = set()
     req_types: set[str] = set()
     triggered: list[RuleTrigger] = []
 
-    # Evaluate deterministically top-to-bottom by priority desc (advanced rules), else preserve input order.
-    def _rule_sort_key(it: Any) -> tuple[int, int]:
-        if not isinstance(it, dict):
-            return (0, 0)
-        pr = it.get("priority")
-        p = int(pr) if isinstance(pr, int) else 0
-        return (-p, 0)
-
-    ordered = [r for r in rules if isinstance(r, dict)]
-    ordered.sort(key=_rule_sort_key)
+    # Scan the blob once for the union of every rule's keyword phrases; predicates then test membership.
+    found_phrases = _phrases_found(blob, list(compiled.phrases)) if blob else None
 
-    for rule in ordered[:800]:
-        rid = rule.get("id")
-        if not isinstance(rid, str) or not rid.strip():
-            continue
-        rid_s = rid.strip()
-
-        note = rule.get("when")
-        if not isinstance(note, str) or not note.strip():
-            note = rule.get("description") if isinstance(rule.get("description"), str) else None
-
-        matched_paths: list[str] = []
-        matched_keywords: list[str] = []
-
-        # Advanced rule shape: match_any groups + requires
-        match_any = rule.get("match_any")
-        requires = rule.get("requires")
-        if isinstance(match_any, list):
-            group_matched = False
-            for group in match_any[:50]:
-                if not isinstance(group, dict):
-                    continue
-                ok, mp, mk = _eval_match_group(group, paths=paths, blob=blob)
+    for spec in compiled.rules:
+        if spec.groups is not None:
+            for group in spec.groups:
+                ok, matched_paths, matched_keywords = _match_group(
+                    group, paths=paths, blob=blob, found_phrases=found_phrases
+                )
                 if ok:
-                    group_matched = True
-                    matched_paths = mp
-                    matched_keywords = mk
                     break
-            if not group_matched:
+            else:
                 continue
-            r_docs, r_types = _extract_required_from_requires(requires)
-            req_docs |= r_docs
-            req_types |= r_types
-            triggered.append(
-                RuleTrigger(
-                    rule_id=rid_s,
-                    matched_paths=matched_paths,
-                    note=note.strip() if isinstance(note, str) and note.strip() else None,
-                    matched_keywords=matched_keywords,
-                )
-            )
-            continue
-
-        # Legacy rule shape: match + actions
-        match = rule.get("match") if isinstance(rule.get("match"), dict) else {}
-        actions = rule.get("actions") if isinstance(rule.get("actions"), dict) else {}
-
-        any_globs = _normalize_globs(match.get("paths_any")) if isinstance(match.get("paths_any"), list) else []
-        created_globs = _normalize_globs(match.get("created_paths_any")) if isinstance(match.get("created_paths_any"), list) else []
-        modified_globs = _normalize_globs(match.get("modified_paths_any")) if isinstance(match.get("modified_paths_any"), list) else []
-        deleted_globs = _normalize_globs(match.get("deleted_paths_any")) if isinstance(match.get("deleted_paths_any"), list) else []
-
-        if any_globs:
-            matched_paths.extend([p for p in paths["any"] if match_globs(p, any_globs)])
-        if created_globs:
-            matched_paths.extend([p for p in paths["created"] if match_globs(p, created_globs)])
-        if modified_globs:
-            matched_paths.extend([p for p in paths["modified"] if match_globs(p, modified_globs)])
-        if deleted_globs:
-            matched_paths.extend([p for p in paths["deleted"] if match_globs(p, deleted_globs)])
-
-        matched_paths = sorted(set(matched_paths))
-        if not matched_paths:
-            continue
-
-        doc_ids = actions.get("require_doc_ids")
-        if isinstance(doc_ids, list):
-            for d in doc_ids[:200]:
-                if isinstance(d, str) and d.strip():
-                    req_docs.add(d.strip())
-
-        create_types = actions.get("require_create_types")
-        if isinstance(create_types, list):
-            for t in create_types[:50]:
-                if isinstance(t, str) and t.strip():
-                    req_types.add(t.strip())
+        else:
+            # Legacy: one fused pass over `any` (in input order); a path hits via `paths_any` or via the glob
+            # set of its own action bucket.
+            any_match = spec.any_match
+            action_match = spec.action_match
+            hits: dict[str, None] = {}
+            for p, a in zip(paths["any"], any_actions):
+                if p in hits:
+                    continue
+                m = action_match.get(a) if a else None
+                if (any_match and any_match(p)) or (m and m(p)):
+                    hits[p] = None
+                    if len(hits) >= 40:
+                        break
+            if not hits:
+                continue
+            matched_paths = list(hits)
+            matched_keywords = []
 
-        legacy_note = actions.get("note")
+        req_docs |= spec.req_docs
+        req_types |= spec.req_types
         triggered.append(
             RuleTrigger(
-                rule_id=rid_s,
-                matched_paths=matched_paths[:40],
-                note=legacy_note if isinstance(legacy_note, str) and legacy_note.strip() else (note if isinstance(note, str) else None),
-                matched_keywords=[],
+                rule_id=spec.rule_id,
+                matched_paths=matched_paths,
+                note=spec.note,
+                matched_keywords=matched_keywords,
             )
         )
 
@@ -330,13 +622,11 @@ def evaluate_coverage_rules_for_write_scopes(
     *,
     write_scopes: list[str],
     keywords_text: str | None = None,
+    use_cache: bool = False,
 ) -> CoveragePlan:
     """
     Deterministic evaluation for planning-time enforcement:
     treat each planned write scope as a "modified path" (best-effort).
     """
-    changed_files: list[dict[str, Any]] = []
-    for w in write_scopes[:5000]:
-        if isinstance(w, str) and w.strip():
-            changed_files.append({"path": w.strip().replace("\\", "/"), "action": "modified"})
-    return evaluate_coverage_rules(rules, changed_files=changed_files, keywords_text=keywords_text)
+    changed_files = [(w, "modified") for w in write_scopes[:5000] if isinstance(w, str)]
+    return evaluate_coverage_rules(rules, changed_files=changed_files, keywords_text=keywords_text, use_cache=use_cache)
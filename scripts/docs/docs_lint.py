@@ -14,6 +14,7 @@ Updated: 2026-02-02
 from __future__ import annotations
 
 import argparse
+import functools
 import sys
 from pathlib import Path
 from typing import Any
@@ -23,8 +24,16 @@ sys.path.insert(0, str(SCRIPT_ROOT))
 
 from lib.docs_registry import get_docs_registry_path, load_docs_registry  # noqa: E402
 from lib.docs_validation import find_broken_links, find_orphan_docs, run_registry_md_check, validate_registry_v2  # noqa: E402
-from lib.io import utc_now, write_json, write_text  # noqa: E402
-from lib.project import detect_project_dir, load_project_config  # noqa: E402
+from lib.io import dumps_json, utc_now, write_text_batch  # noqa: E402
+from lib.project import detect_project_dir, get_sessions_dir, load_project_config  # noqa: E402
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_out(project_root: Path, p: str) -> Path:
+    cand = Path(p)
+    if cand.is_absolute():
+        return cand
+    return (project_root / cand).resolve()
 
 
 def main() -> int:
@@ -33,6 +42,11 @@ def main() -> int:
     parser.add_argument("--registry-path", default=None)
     parser.add_argument("--out-json", default=None, help="Optional output JSON path (repo-relative or absolute)")
     parser.add_argument("--out-md", default=None, help="Optional output MD path (repo-relative or absolute)")
+    parser.add_argument(
+        "--cache-md-check",
+        action="store_true",
+        help="Cache the registry markdown drift check under <sessions_dir>/.cache (writes files; off by default).",
+    )
     args = parser.parse_args()
 
     project_root = detect_project_dir(args.project_dir)
@@ -43,7 +57,8 @@ def main() -> int:
     issues, summary, type_map = validate_registry_v2(project_root, registry_path=registry_path, registry=registry)
 
     # Drift check for generated markdown view.
-    md_check = run_registry_md_check(project_root, registry_path=registry_path)
+    md_cache_dir = (project_root / get_sessions_dir(project_root, cfg) / ".cache" / "registry_md_check") if args.cache_md_check else None
+    md_check = run_registry_md_check(project_root, registry_path=registry_path, cache_dir=md_cache_dir)
     if md_check.get("status") == "failed":
         issues.append({"severity": "error", "message": "docs/DOCUMENTATION_REGISTRY.md is out of sync (run scripts/docs/generate_registry_md.py)"})
     elif md_check.get("status") == "skipped":
@@ -80,18 +95,14 @@ def main() -> int:
         },
     }
 
-    def _resolve_out(p: str) -> Path:
-        cand = Path(p)
-        if cand.is_absolute():
-            return cand
-        return (project_root / cand).resolve()
-
+    # Reports are written together at the end (one batch of temp-file swaps).
+    outputs: list[tuple[Path, str]] = []
     if isinstance(args.out_json, str) and args.out_json.strip():
-        outp = _resolve_out(args.out_json.strip())
-        write_json(outp, payload)
+        outp = _resolve_out(project_root, args.out_json.strip())
+        outputs.append((outp, dumps_json(payload)))
 
     if isinstance(args.out_md, str) and args.out_md.strip():
-        outp = _resolve_out(args.out_md.strip())
+        outp = _resolve_out(project_root, args.out_md.strip())
         md: list[str] = []
         md.append("# Docs Lint Report (at)")
         md.append("")
@@ -117,7 +128,9 @@ def main() -> int:
             for it in broken_links[:20]:
                 md.append(f"- `{it.get('doc','')}` → `{it.get('link','')}` — {it.get('reason','')}")
             md.append("")
-        write_text(outp, "\n".join(md))
+        outputs.append((outp, "\n".join(md)))
+    if outputs:
+        write_text_batch(outputs)
 
     if ok:
         print("OK: docs lint passed.")
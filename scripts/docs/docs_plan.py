@@ -16,17 +16,20 @@ Updated: 2026-02-02
 from __future__ import annotations
 
 import argparse
+import functools
+import itertools
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 SCRIPT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(SCRIPT_ROOT))
 
 from docs.coverage_rules import evaluate_coverage_rules  # noqa: E402
 from lib.docs_registry import get_docs_registry_path, load_docs_registry  # noqa: E402
-from lib.io import utc_now, write_json, write_text  # noqa: E402
+from lib.io import dumps_json, utc_now, write_text_batch  # noqa: E402
 from lib.project import detect_project_dir, get_sessions_dir, load_project_config  # noqa: E402
 from lib.session import resolve_session_dir  # noqa: E402
 from lib.simple_yaml import load_minimal_yaml  # noqa: E402
@@ -40,10 +43,37 @@ def _load_yaml(path: Path) -> dict[str, Any] | None:
     return data if isinstance(data, dict) else None
 
 
-def _collect_changed_files(session_dir: Path) -> list[dict[str, Any]]:
-    out: list[dict[str, Any]] = []
-    for p in sorted((session_dir / "implementation" / "tasks").glob("*.yaml")) + sorted((session_dir / "testing" / "tasks").glob("*.yaml")):
-        data = _load_yaml(p)
+@functools.lru_cache(maxsize=4096)
+def _load_yaml_cached(path_str: str, mtime_ns: int, size: int) -> dict[str, Any] | None:
+    # Keyed by file identity so edits invalidate; callers treat the result as read-only.
+    return _load_yaml(Path(path_str))
+
+
+def _load_task_yaml(path: Path) -> dict[str, Any] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return _load_yaml_cached(str(path), st.st_mtime_ns, st.st_size)
+
+
+def _iter_task_yaml_paths(session_dir: Path) -> Iterator[Path]:
+    return itertools.chain(
+        sorted((session_dir / "implementation" / "tasks").glob("*.yaml")),
+        sorted((session_dir / "testing" / "tasks").glob("*.yaml")),
+    )
+
+
+def _load_task_yamls(paths: list[Path]) -> list[dict[str, Any] | None]:
+    # Reads + parses are I/O-bound; overlap them, keeping results in input order (map preserves it).
+    if len(paths) < 2:
+        return [_load_task_yaml(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as ex:
+        return list(ex.map(_load_task_yaml, paths))
+
+
+def _iter_changed_files(session_dir: Path) -> Iterator[tuple[str, str]]:
+    for data in _load_task_yamls(list(_iter_task_yaml_paths(session_dir))):
         if not data:
             continue
         changed = data.get("changed_files")
@@ -55,17 +85,13 @@ def _collect_changed_files(session_dir: Path) -> list[dict[str, Any]]:
             fp = it.get("path")
             act = it.get("action")
             if isinstance(fp, str) and fp.strip() and act in {"created", "modified", "deleted"}:
-                out.append({"path": fp.strip().replace("\\", "/"), "action": act})
-    # Dedup while keeping action granularity.
-    seen: set[tuple[str, str]] = set()
-    uniq: list[dict[str, Any]] = []
-    for it in out:
-        k = (it["path"], it["action"])
-        if k in seen:
-            continue
-        seen.add(k)
-        uniq.append(it)
-    return uniq
+                yield (fp.strip().replace("\\", "/"), act)
+
+
+def _collect_changed_files(session_dir: Path) -> list[tuple[str, str]]:
+    # (path, action) tuples: dedup keeps action granularity and first-seen order, and the coverage engine
+    # consumes tuples directly (no per-item dicts).
+    return list(dict.fromkeys(_iter_changed_files(session_dir)))
 
 
 def _collect_summary_text(session_dir: Path) -> str:
@@ -76,8 +102,8 @@ def _collect_summary_text(session_dir: Path) -> str:
     """
     chunks: list[str] = []
 
-    for p in sorted((session_dir / "implementation" / "tasks").glob("*.yaml")) + sorted((session_dir / "testing" / "tasks").glob("*.yaml")):
-        data = _load_yaml(p)
+    for p in _iter_task_yaml_paths(session_dir):
+        data = _load_task_yaml(p)
         if not data:
             continue
         s = data.get("summary")
@@ -147,8 +173,6 @@ def main() -> int:
             for t in plan.triggered
         ],
     }
-    write_json(out_dir / "docs_plan.json", payload)
-
     md: list[str] = []
     md.append("# Docs Plan (at)")
     md.append("")
@@ -175,22 +199,21 @@ def main() -> int:
     md.append("")
     md.append("## Triggered rules")
     md.append("")
-    if payload["triggered_rules"]:
-        for r in payload["triggered_rules"][:50]:
-            md.append(f"- `{r['id']}`")
-            if r.get("note"):
-                md.append(f"  - note: {r['note']}")
-            kws = r.get("matched_keywords") if isinstance(r.get("matched_keywords"), list) else []
-            if kws:
-                md.append("  - matched_keywords: " + ", ".join([f"`{k}`" for k in kws[:10]]))
-            paths = r.get("matched_paths") if isinstance(r.get("matched_paths"), list) else []
-            for p in paths[:10]:
-                md.append(f"  - `{p}`")
+    if plan.triggered:
+        # Read the (slotted) triggers directly rather than re-probing the payload dicts built above.
+        for tr in plan.triggered[:50]:
+            md.append(f"- `{tr.rule_id}`")
+            if tr.note:
+                md.append(f"  - note: {tr.note}")
+            if tr.matched_keywords:
+                md.append("  - matched_keywords: " + ", ".join(f"`{k}`" for k in tr.matched_keywords[:10]))
+            md.extend(f"  - `{p}`" for p in tr.matched_paths[:10])
     else:
         md.append("- (none)")
     md.append("")
 
-    write_text(out_dir / "docs_plan.md", "\n".join(md))
+    # Both reports land together (one batch of temp-file swaps).
+    write_text_batch([(out_dir / "docs_plan.json", dumps_json(payload)), (out_dir / "docs_plan.md", "\n".join(md))])
     print(str(out_dir / "docs_plan.md"))
     return 0
 
@@ -14,6 +14,8 @@ Updated: 2026-02-02
 from __future__ import annotations
 
 import argparse
+import functools
+import io
 import json
 import sys
 from pathlib import Path
@@ -22,20 +24,48 @@ from typing import Any
 SCRIPT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(SCRIPT_ROOT))
 
-from lib.io import write_text  # noqa: E402
+from lib.io import write_text_batch  # noqa: E402
 from lib.path_policy import normalize_repo_relative_posix_path  # noqa: E402
-from lib.project import detect_project_dir, load_project_config  # noqa: E402
+from lib.project import detect_project_dir, load_project_config_cached  # noqa: E402
 from lib.docs_registry import get_docs_registry_path  # noqa: E402
 
 
-def _load_json(path: Path) -> dict[str, Any] | None:
+@functools.lru_cache(maxsize=16)
+def _load_json_at(path_str: str, mtime_ns: int, size: int) -> dict[str, Any] | None:
+    # Keyed by file identity so edits invalidate; callers treat the result as read-only.
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(Path(path_str).read_bytes())
     except Exception:
         return None
     return data if isinstance(data, dict) else None
 
 
+def _load_json(path: Path) -> dict[str, Any] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return _load_json_at(str(path), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_under(root: Path, rel: str) -> Path:
+    # `root` is fixed for the run; memoize so repeated lookups of the same target skip the symlink walk.
+    return (root / rel).resolve()
+
+
+# Registry paths repeat (shared prefixes, artifacts pointing at the same sources); bounded so huge registries
+# cannot grow it without limit.
+_norm_path = functools.lru_cache(maxsize=8192)(normalize_repo_relative_posix_path)
+
+# Newlines would break a table row. The mapping is 1:1 in length, so it runs after the 180-char cut.
+_WHEN_TRANS = str.maketrans({"\n": " "})
+
+# Fixed row templates (bound `str.format`), filled positionally per row.
+_DOC_ROW = "| {} | {} | `{}` | {} | {} | {} | `{}` | {} | {} |\n".format
+_GEN_ROW = "| `{}` | `{}` | `{}` | {} | {} |\n".format
+
+
 def _render(registry: dict[str, Any], *, registry_path: str) -> str:
     version = registry.get("version")
     if version != 2:
@@ -54,63 +84,84 @@ def _render(registry: dict[str, Any], *, registry_path: str) -> str:
     items: list[dict[str, Any]] = [it for it in docs if isinstance(it, dict)]
     items.sort(key=_key_doc)
 
-    lines: list[str] = []
-    lines.append("# Documentation Registry (at)")
-    lines.append("")
-    lines.append("AUTO-GENERATED. DO NOT EDIT.")
-    lines.append(f"Source of truth: `{registry_path}`")
-    lines.append("")
-    lines.append("This file is generated from the JSON registry and is intended for fast human scanning.")
-    lines.append("")
-    lines.append("## Index")
-    lines.append("")
-    lines.append("| Tier | Type | ID | Status | Owners | Title | Path | When | Tags |")
-    lines.append("|---:|---|---|---|---|---|---|---|---|")
+    # Emit straight into one buffer (no per-line list + join copy).
+    buf = io.StringIO()
+    w = buf.write
+    w("# Documentation Registry (at)\n")
+    w("\n")
+    w("AUTO-GENERATED. DO NOT EDIT.\n")
+    w(f"Source of truth: `{registry_path}`\n")
+    w("\n")
+    w("This file is generated from the JSON registry and is intended for fast human scanning.\n")
+    w("\n")
+    w("## Index\n")
+    w("\n")
+    w("| Tier | Type | ID | Status | Owners | Title | Path | When | Tags |\n")
+    w("|---:|---|---|---|---|---|---|---|---|\n")
     for it in items[:4000]:
-        doc_id = it.get("id") if isinstance(it.get("id"), str) else ""
-        doc_type = it.get("type") if isinstance(it.get("type"), str) else ""
-        title = it.get("title") if isinstance(it.get("title"), str) else ""
-        path = it.get("path") if isinstance(it.get("path"), str) else ""
-        when = it.get("when") if isinstance(it.get("when"), str) else ""
-        tags = it.get("tags") if isinstance(it.get("tags"), list) else []
-        owners = it.get("owners") if isinstance(it.get("owners"), list) else []
-        status = it.get("status") if isinstance(it.get("status"), str) else ""
-        tier = it.get("tier") if isinstance(it.get("tier"), int) else ""
-        norm = normalize_repo_relative_posix_path(path) if isinstance(path, str) and path else None
-        path_s = norm or path
-        if not doc_id or not path_s:
+        g = it.get
+        # Required fields first: rows without an id or path are skipped before any other field is read.
+        doc_id = v if isinstance(v := g("id"), str) else ""
+        path = v if isinstance(v := g("path"), str) else ""
+        if not doc_id or not path:
             continue
-        when_s = (when.strip().replace("\n", " "))[:180]
-        tags_s = ", ".join([str(t).strip() for t in tags[:12] if isinstance(t, str) and str(t).strip()])
-        owners_s = ", ".join([str(o).strip() for o in owners[:8] if isinstance(o, str) and str(o).strip()])
-        lines.append(f"| {tier} | {doc_type} | `{doc_id}` | {status} | {owners_s} | {title} | `{path_s}` | {when_s} | {tags_s} |")
+        path_s = _norm_path(path) or path
+        doc_type = v if isinstance(v := g("type"), str) else ""
+        title = v if isinstance(v := g("title"), str) else ""
+        when = v if isinstance(v := g("when"), str) else ""
+        tags = v if isinstance(v := g("tags"), list) else []
+        owners = v if isinstance(v := g("owners"), list) else []
+        status = v if isinstance(v := g("status"), str) else ""
+        tier = v if isinstance(v := g("tier"), int) else ""
+        when_s = when.strip()[:180].translate(_WHEN_TRANS)
+        tags_s = ", ".join(s for t in tags[:12] if isinstance(t, str) and (s := t.strip()))
+        owners_s = ", ".join(s for o in owners[:8] if isinstance(o, str) and (s := o.strip()))
+        w(_DOC_ROW(tier, doc_type, doc_id, status, owners_s, title, path_s, when_s, tags_s))
 
     if generated:
-        lines.append("")
-        lines.append("## Generated Artifacts")
-        lines.append("")
-        lines.append("| ID | Path | Source | Generator | Mode |")
-        lines.append("|---|---|---|---|---|")
+        w("\n")
+        w("## Generated Artifacts\n")
+        w("\n")
+        w("| ID | Path | Source | Generator | Mode |\n")
+        w("|---|---|---|---|---|\n")
         for it in generated[:200]:
             if not isinstance(it, dict):
                 continue
-            gid = it.get("id") if isinstance(it.get("id"), str) else ""
-            gpath = it.get("path") if isinstance(it.get("path"), str) else ""
-            src = it.get("source") if isinstance(it.get("source"), str) else ""
-            generator = it.get("generator") if isinstance(it.get("generator"), str) else ""
-            mode = it.get("mode") if isinstance(it.get("mode"), str) else ""
+            g = it.get
+            gid = v if isinstance(v := g("id"), str) else ""
+            gpath = v if isinstance(v := g("path"), str) else ""
             if not gid or not gpath:
                 continue
-            gpath_norm = normalize_repo_relative_posix_path(gpath) or gpath
-            src_norm = normalize_repo_relative_posix_path(src) or src
-            lines.append(f"| `{gid}` | `{gpath_norm}` | `{src_norm}` | {generator} | {mode} |")
-    lines.append("")
-    lines.append("## Notes")
-    lines.append("")
-    lines.append("- Tiers: 1=core contract, 2=architecture/conventions, 3=how-to, 4=reference/appendix.")
-    lines.append("- Keep docs concise and keep this registry accurate; gates may fail on drift.")
-    lines.append("")
-    return "\n".join(lines)
+            src = v if isinstance(v := g("source"), str) else ""
+            generator = v if isinstance(v := g("generator"), str) else ""
+            mode = v if isinstance(v := g("mode"), str) else ""
+            gpath_norm = _norm_path(gpath) or gpath
+            src_norm = (_norm_path(src) if src else None) or src
+            w(_GEN_ROW(gid, gpath_norm, src_norm, generator, mode))
+    w("\n")
+    w("## Notes\n")
+    w("\n")
+    w("- Tiers: 1=core contract, 2=architecture/conventions, 3=how-to, 4=reference/appendix.\n")
+    w("- Keep docs concise and keep this registry accurate; gates may fail on drift.\n")
+    w("\n")
+    return buf.getvalue()
+
+
+def _file_matches(path: Path, data: bytes) -> bool:
+    """Byte-compare `path` against `data` in 1 MiB chunks without decoding; a size mismatch needs only a stat."""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        view = memoryview(data)
+        pos = 0
+        with path.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                if view[pos : pos + len(chunk)] != chunk:
+                    return False
+                pos += len(chunk)
+        return pos == len(data)
+    except OSError:
+        return False
 
 
 def main() -> int:
@@ -122,9 +173,9 @@ def main() -> int:
     args = parser.parse_args()
 
     project_root = detect_project_dir(args.project_dir)
-    cfg = load_project_config(project_root) or {}
+    cfg = load_project_config_cached(project_root) or {}
     registry_path = args.registry_path or get_docs_registry_path(cfg)
-    reg_file = (project_root / registry_path).resolve()
+    reg_file = _resolve_under(project_root, registry_path)
     if not reg_file.exists():
         print(f"ERROR: missing registry JSON: {registry_path}", file=sys.stderr)
         return 2
@@ -139,21 +190,32 @@ def main() -> int:
     except Exception as exc:
         print(f"ERROR: failed to render registry markdown: {exc}", file=sys.stderr)
         return 2
-    out_path = (project_root / args.out).resolve()
+    out_path = _resolve_under(project_root, args.out)
 
-    current = ""
-    if out_path.exists():
-        current = out_path.read_text(encoding="utf-8", errors="ignore")
+    rendered_bytes = rendered.encode("utf-8")
+    unchanged = _file_matches(out_path, rendered_bytes)
 
     if args.check:
-        if current != rendered:
+        # Exact bytes are the common in-sync case; the lenient text compare (newline translation, undecodable
+        # bytes ignored) only runs when they differ.
+        in_sync = unchanged
+        if not in_sync:
+            try:
+                raw = out_path.read_bytes()
+            except FileNotFoundError:
+                raw = None
+            if raw is not None:
+                current = raw.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+                in_sync = current == rendered
+        if not in_sync:
             print(f"DRIFT: {args.out} is not in sync with {registry_path}", file=sys.stderr)
             return 1
         print("OK: registry markdown is in sync.")
         return 0
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    write_text(out_path, rendered)
+    # Leave an identical file untouched (no mtime bump, so downstream tools see no change).
+    if not unchanged:
+        write_text_batch([(out_path, rendered)], newline="\n")
     print(str(out_path))
     return 0
 
@@ -11,18 +11,19 @@ Updated: 2026-02-02
 """
 from __future__ import annotations
 
-import argparse
+import functools
 import json
-import shutil
+import os
 import sys
+import types
 from pathlib import Path
 from typing import Any
 
 SCRIPT_ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(SCRIPT_ROOT))
 
-from lib.docs_registry import build_doc_id_to_path_map, get_docs_registry_path, get_docs_require_registry, load_docs_registry  # noqa: E402
-from lib.project import detect_project_dir, get_plugin_root, get_sessions_dir, load_project_config  # noqa: E402
+from lib.docs_registry import build_doc_id_to_path_map, get_docs_registry_path, get_docs_require_registry, load_docs_registry_cached  # noqa: E402
+from lib.project import detect_project_dir, get_plugin_root, get_sessions_dir, load_project_config_cached  # noqa: E402
 
 
 def _fail(msg: str) -> int:
@@ -42,24 +43,93 @@ def _is_non_empty_string(value: Any) -> bool:
 
 
 
+# `commands.<lang>` keys whose first token must be on PATH.
+_QUALITY_KEYS = ("format", "lint", "typecheck", "test", "build", "e2e")
+
+
 def _first_token(cmd: str) -> str | None:
-    parts = cmd.strip().split()
+    # maxsplit=1: only the first token is needed, so stop after it (whitespace-split ignores leading space).
+    parts = cmd.split(None, 1)
     return parts[0] if parts else None
 
 
+# PATH/PATHEXT are read once per run; `dict.fromkeys` drops duplicate entries (common in layered shells).
+_PATH_DIRS = tuple(dict.fromkeys(d for d in os.environ.get("PATH", os.defpath).split(os.pathsep) if d))
+_PATHEXT = tuple(e.lower() for e in os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").split(os.pathsep) if e) if os.name == "nt" else ()
+
+
+def _is_executable(path: str) -> bool:
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+@functools.lru_cache(maxsize=256)
+def _which_cached(token: str) -> str | None:
+    """
+    Minimal `shutil.which` for existence checks: one walk over the precomputed PATH, first hit wins.
+    Command tokens repeat across languages (uv, npx, python, ...), so each distinct token is scanned once.
+    """
+    names = (token,)
+    if _PATHEXT and not token.lower().endswith(_PATHEXT):
+        names = tuple(token + ext for ext in _PATHEXT) + names
+    if os.path.dirname(token):
+        return next((n for n in names if _is_executable(n)), None)
+    for d in _PATH_DIRS:
+        for n in names:
+            cand = os.path.join(d, n)
+            if _is_executable(cand):
+                return cand
+    return None
+
+
+@functools.lru_cache(maxsize=256)
 def _tool_exists(token: str) -> bool:
     if not token:
         return False
     if token.startswith("./") or token.startswith("../") or token.startswith("/"):
         return Path(token).expanduser().exists()
-    return shutil.which(token) is not None
+    return _which_cached(token) is not None
+
+
+_USAGE = "usage: doctor.py [-h] [--project-dir PROJECT_DIR] [--json]"
+_HELP = f"""{_USAGE}
+
+Doctor: validate at overlay preconditions (portable, deterministic).
+
+options:
+  -h, --help            show this help message and exit
+  --project-dir PROJECT_DIR
+  --json                Emit a machine-readable report to stdout.
+
+Long options must be spelled in full (no prefix abbreviations such as --proj); --project-dir=PATH is accepted.
+"""
+
+
+def _parse_args(argv: list[str]) -> types.SimpleNamespace:
+    # Two fixed flags: a plain argv walk avoids importing argparse (and its gettext chain) on every run.
+    args = types.SimpleNamespace(project_dir=None, json=False)
+    it = iter(argv)
+    for a in it:
+        if a in {"-h", "--help"}:
+            print(_HELP, end="")
+            raise SystemExit(0)
+        if a == "--json":
+            args.json = True
+        elif a == "--project-dir":
+            value = next(it, None)
+            if value is None:
+                print(f"{_USAGE}\ndoctor.py: error: argument --project-dir: expected one argument", file=sys.stderr)
+                raise SystemExit(2)
+            args.project_dir = value
+        elif a.startswith("--project-dir="):
+            args.project_dir = a.partition("=")[2]
+        else:
+            print(f"{_USAGE}\ndoctor.py: error: unrecognized arguments: {a}", file=sys.stderr)
+            raise SystemExit(2)
+    return args
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser(description="Doctor: validate at overlay preconditions (portable, deterministic).")
-    parser.add_argument("--project-dir", default=None)
-    parser.add_argument("--json", action="store_true", help="Emit a machine-readable report to stdout.")
-    args = parser.parse_args()
+    args = _parse_args(sys.argv[1:])
 
     project_root = detect_project_dir(args.project_dir)
     report: dict[str, Any] = {"version": 2, "project_root": str(project_root), "ok": True, "warnings": 0, "checks": []}
@@ -74,7 +144,7 @@ def main() -> int:
             report["warnings"] = int(report.get("warnings") or 0) + 1
 
     cfg_path = project_root / ".claude" / "project.yaml"
-    config = load_project_config(project_root)
+    config = load_project_config_cached(project_root)
     if not cfg_path.exists():
         check("config.exists", False, "Missing .claude/project.yaml (run /at:init-project)")
     elif config is None:
@@ -106,16 +176,16 @@ def main() -> int:
         check("sessions_dir.exists", sessions_root.exists(), f"expected sessions dir at {sessions_root}")
 
         # Tooling preflight
-        check("tool.uv", shutil.which("uv") is not None, "uv must be installed and on PATH (https://astral.sh/uv/)")
+        check("tool.uv", _which_cached("uv") is not None, "uv must be installed and on PATH (https://astral.sh/uv/)")
 
         # Quality commands: best-effort check that first tokens exist on PATH.
-        cmds = config.get("commands") if isinstance(config.get("commands"), dict) else {}
+        cmds = commands if isinstance(commands, dict) else {}
         if isinstance(cmds, dict):
             missing: list[str] = []
             for lang, spec in cmds.items():
                 if not isinstance(spec, dict):
                     continue
-                for key in ("format", "lint", "typecheck", "test", "build", "e2e"):
+                for key in _QUALITY_KEYS:
                     raw = spec.get(key)
                     if not isinstance(raw, str) or not raw.strip():
                         continue
@@ -128,7 +198,7 @@ def main() -> int:
                 check("commands.tools", True, "Configured command first tokens appear available", severity="warning")
 
         # LSP: best-effort check that server commands exist when enabled.
-        lsp_cfg = config.get("lsp") if isinstance(config.get("lsp"), dict) else {}
+        lsp_cfg = v if isinstance(v := config.get("lsp"), dict) else {}
         lsp_enabled = bool(lsp_cfg.get("enabled") is True)
         if lsp_enabled:
             plugin_root = get_plugin_root()
@@ -142,7 +212,7 @@ def main() -> int:
                     check("lsp.config", False, f"Invalid .lsp.json ({exc})", severity="warning")
                     lsp_data = {}
                 if isinstance(lsp_data, dict):
-                    proj = config.get("project") if isinstance(config.get("project"), dict) else {}
+                    proj = project if isinstance(project, dict) else {}
                     primary: list[str] = []
                     if isinstance(proj, dict) and isinstance(proj.get("primary_languages"), list):
                         primary = [x for x in proj.get("primary_languages") if isinstance(x, str)]
@@ -153,7 +223,7 @@ def main() -> int:
                         if not isinstance(entry, dict):
                             continue
                         cmd = entry.get("command")
-                        if isinstance(cmd, str) and cmd.strip() and shutil.which(cmd.strip()) is None:
+                        if isinstance(cmd, str) and cmd.strip() and _which_cached(cmd.strip()) is None:
                             missing_servers.append(f"{lang}:{cmd.strip()}")
                     if missing_servers:
                         check("lsp.servers", False, "Missing LSP server commands: " + ", ".join(missing_servers[:20]), severity="warning")
@@ -163,7 +233,7 @@ def main() -> int:
         # Docs registry (optional unless require_registry=true)
         require_registry = get_docs_require_registry(config)
         registry_path = get_docs_registry_path(config)
-        registry = load_docs_registry(project_root, registry_path)
+        registry = load_docs_registry_cached(project_root, registry_path)
         docs_map = build_doc_id_to_path_map(registry)
         if require_registry:
             check("docs.require_registry", True, "docs.require_registry=true")
@@ -26,7 +26,7 @@ from lib.project import detect_project_dir  # noqa: E402
 
 def _read_hook_input() -> dict[str, Any] | None:
     try:
-        return json.load(sys.stdin)
+        return json.loads(sys.stdin.buffer.read())
     except Exception:
         return None
 
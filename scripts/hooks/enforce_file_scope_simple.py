@@ -33,7 +33,7 @@ from lib.session_env import get_file_scope_from_env, get_session_from_env  # noq
 
 def _read_hook_input() -> dict[str, Any] | None:
     try:
-        return json.load(sys.stdin)
+        return json.loads(sys.stdin.buffer.read())
     except Exception:
         return None
 
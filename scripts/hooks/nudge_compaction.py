@@ -32,7 +32,7 @@ TRANSCRIPT_BYTES_THRESHOLD = 1_000_000  # ~1MB
 
 def _read_hook_input() -> dict[str, Any] | None:
     try:
-        data = json.load(sys.stdin)
+        data = json.loads(sys.stdin.buffer.read())
     except Exception:
         return None
     return data if isinstance(data, dict) else None
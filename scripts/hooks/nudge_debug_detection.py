@@ -67,7 +67,7 @@ _PATTERNS: dict[str, list[tuple[re.Pattern[str], str, str]]] = {
 
 def _read_hook_input() -> dict[str, Any] | None:
     try:
-        data = json.load(sys.stdin)
+        data = json.loads(sys.stdin.buffer.read())
     except Exception:
         return None
     return data if isinstance(data, dict) else None
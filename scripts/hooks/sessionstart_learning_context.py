@@ -29,7 +29,7 @@ from learning.learning_state import learning_root  # noqa: E402
 
 def _read_hook_input() -> dict[str, Any] | None:
     try:
-        return json.load(sys.stdin)
+        return json.loads(sys.stdin.buffer.read())
     except Exception:
         return None
 
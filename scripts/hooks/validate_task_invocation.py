@@ -35,7 +35,7 @@ _AGENTS_REQUIRING_TASK_CONTEXT = {"implementor", "tests-builder"}
 
 def _load_hook_input() -> dict[str, Any] | None:
     try:
-        data = json.load(sys.stdin)
+        data = json.loads(sys.stdin.buffer.read())
     except Exception:
         return None
     return data if isinstance(data, dict) else None
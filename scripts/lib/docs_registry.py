@@ -11,6 +11,7 @@ Updated: 2026-02-02
 """
 from __future__ import annotations
 
+import functools
 import json
 from pathlib import Path
 from typing import Any
@@ -35,12 +36,34 @@ def load_docs_registry(project_root: Path, registry_path: str) -> dict[str, Any]
     if not reg.exists():
         return None
     try:
-        data = json.loads(reg.read_text(encoding="utf-8"))
+        data = json.loads(reg.read_bytes())
     except Exception:
         return None
     return data if isinstance(data, dict) else None
 
 
+@functools.lru_cache(maxsize=32)
+def _load_docs_registry_at(path_str: str, mtime_ns: int, size: int) -> dict[str, Any] | None:
+    try:
+        data = json.loads(Path(path_str).read_bytes())
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def load_docs_registry_cached(project_root: Path, registry_path: str) -> dict[str, Any] | None:
+    """
+    Like `load_docs_registry`, but memoized per file identity (path + mtime + size) for the process.
+    The returned dict is shared: callers must treat it as read-only.
+    """
+    reg = (project_root / registry_path).resolve()
+    try:
+        st = reg.stat()
+    except OSError:
+        return None
+    return _load_docs_registry_at(str(reg), st.st_mtime_ns, st.st_size)
+
+
 def build_doc_id_to_path_map(registry: dict[str, Any] | None) -> dict[str, str] | None:
     if not registry or not isinstance(registry, dict):
         return None
@@ -14,6 +14,9 @@ Updated: 2026-02-02
 from __future__ import annotations
 
 import fnmatch
+import hashlib
+import json
+import os
 import re
 import subprocess
 import sys
@@ -212,9 +215,54 @@ def validate_registry_v2(
     return (issues, summary, type_map)
 
 
-def run_registry_md_check(project_root: Path, *, registry_path: str) -> dict[str, Any]:
+_MD_CHECK_CACHE_MAX = 32
+
+
+def _md_check_cache_key(project_root: Path, *, registry_path: str, script: Path) -> str:
+    # Everything the `--check` subprocess reads: registry bytes, markdown bytes, the generator itself, and the
+    # `scripts/lib` modules it imports (all of them, so transitive imports are covered too).
+    h = hashlib.blake2b(digest_size=16)
+    h.update(registry_path.encode("utf-8") + b"\0")
+    for f in ((project_root / registry_path).resolve(), (project_root / "docs" / "DOCUMENTATION_REGISTRY.md").resolve()):
+        try:
+            h.update(f.read_bytes())
+        except OSError:
+            h.update(b"\0missing")
+        h.update(b"\0")
+    lib_dir = script.parents[1] / "lib"
+    try:
+        lib_files = sorted(lib_dir.glob("*.py"))
+    except OSError:
+        lib_files = []
+    for f in (script, *lib_files):
+        try:
+            st = f.stat()
+            h.update(f"{f}:{st.st_mtime_ns}:{st.st_size}\0".encode("utf-8"))
+        except OSError:
+            pass
+    return h.hexdigest()
+
+
+def _md_check_cache_store(cache_dir: Path, key: str, result: dict[str, Any]) -> None:
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_dir / f"{key}.json.tmp"
+        tmp.write_text(json.dumps(result, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, cache_dir / f"{key}.json")
+        entries = sorted(cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+        for old in entries[_MD_CHECK_CACHE_MAX:]:
+            old.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def run_registry_md_check(project_root: Path, *, registry_path: str, cache_dir: Path | None = None) -> dict[str, Any]:
     """
     Deterministic check: docs/DOCUMENTATION_REGISTRY.md must be in sync with the JSON registry.
+
+    With `cache_dir`, results are memoized on disk keyed by a blake2b digest of the registry, the markdown,
+    and the generator script, so an unchanged registry skips the subprocess. This writes under `cache_dir`
+    (oldest entries pruned beyond 32); cache I/O failures fall back to running the check.
     """
     script = (project_root / "scripts" / "docs" / "generate_registry_md.py").resolve()
     plugin_root = Path((__import__("os").environ.get("CLAUDE_PLUGIN_ROOT") or "")).expanduser()
@@ -226,6 +274,17 @@ def run_registry_md_check(project_root: Path, *, registry_path: str) -> dict[str
     if not script.exists():
         return {"status": "skipped", "reason": "missing scripts/docs/generate_registry_md.py"}
 
+    key = ""
+    if cache_dir is not None:
+        key = _md_check_cache_key(project_root, registry_path=registry_path, script=script)
+        hit = cache_dir / f"{key}.json"
+        try:
+            cached = json.loads(hit.read_bytes())
+        except (OSError, ValueError):
+            cached = None
+        if isinstance(cached, dict) and cached.get("status") in {"passed", "failed"}:
+            return cached
+
     proc = subprocess.run(
         [sys.executable, str(script), "--project-dir", str(project_root), "--registry-path", registry_path, "--check"],
         cwd=str(project_root),
@@ -235,7 +294,10 @@ def run_registry_md_check(project_root: Path, *, registry_path: str) -> dict[str
         text=True,
     )
     out = (proc.stdout or "")[-4000:]
-    return {"status": "passed" if proc.returncode == 0 else "failed", "exit_code": proc.returncode, "output_tail": out}
+    result = {"status": "passed" if proc.returncode == 0 else "failed", "exit_code": proc.returncode, "output_tail": out}
+    if cache_dir is not None:
+        _md_check_cache_store(cache_dir, key, result)
+    return result
 
 
 def find_orphan_docs(project_root: Path, registry: dict[str, Any], type_map: dict[str, dict[str, Any]]) -> list[str]:
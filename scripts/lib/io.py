@@ -12,6 +12,7 @@ Updated: 2026-02-02
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -48,9 +49,41 @@ def write_text(path: Path, content: str) -> None:
     path.write_text(content, encoding="utf-8")
 
 
+def dumps_json(data: dict[str, Any], *, indent: int = 2, sort_keys: bool = True) -> str:
+    """Serialize JSON exactly as `write_json` writes it (trailing newline included)."""
+    return json.dumps(data, indent=indent, sort_keys=sort_keys) + "\n"
+
+
 def write_json(path: Path, data: dict[str, Any], *, indent: int = 2, sort_keys: bool = True) -> None:
     """Write JSON to file, creating parent directories as needed."""
-    write_text(path, json.dumps(data, indent=indent, sort_keys=sort_keys) + "\n")
+    write_text(path, dumps_json(data, indent=indent, sort_keys=sort_keys))
+
+
+def write_text_batch(items: list[tuple[Path, str]], *, newline: str | None = None) -> None:
+    """
+    Write several text files as one batch: each goes to a sibling `.tmp` file, then all are swapped in
+    with `os.replace`, so readers never see a partially written file. `newline` is passed to `open`
+    (use "\n" for byte-stable generated files).
+    """
+    pending: list[tuple[Path, Path]] = []
+    try:
+        for path, content in items:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            pending.append((tmp, path))
+            with tmp.open("w", encoding="utf-8", newline=newline) as fh:
+                fh.write(content)
+        while pending:
+            tmp, path = pending[0]
+            os.replace(tmp, path)
+            pending.pop(0)
+    finally:
+        # On failure, do not leave staged temp files behind.
+        for tmp, _ in pending:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
 
 
 def load_json(path: Path) -> dict[str, Any]:
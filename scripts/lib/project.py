@@ -11,6 +11,7 @@ Updated: 2026-02-02
 """
 from __future__ import annotations
 
+import functools
 import json
 import os
 from pathlib import Path
@@ -28,12 +29,20 @@ def detect_project_dir(explicit: str | None = None) -> Path:
     2) CLAUDE_PROJECT_DIR environment variable
     3) Current working directory
     """
+    cwd = os.getcwd()
     if explicit:
-        return Path(explicit).expanduser().resolve()
+        return _resolve_dir(os.path.join(cwd, Path(explicit).expanduser()))
     env_project = os.environ.get("CLAUDE_PROJECT_DIR")
     if env_project:
-        return Path(env_project).resolve()
-    return Path.cwd().resolve()
+        return _resolve_dir(os.path.join(cwd, env_project))
+    return _resolve_dir(cwd)
+
+
+@functools.lru_cache(maxsize=16)
+def _resolve_dir(abs_path: str) -> Path:
+    # Callers anchor relative inputs at the current cwd first (plain join, no lexical `..` collapsing), so the
+    # key is absolute: a later chdir or env change yields a different key instead of a stale hit.
+    return Path(abs_path).resolve()
 
 
 def load_project_config(project_root: Path) -> dict[str, Any] | None:
@@ -48,6 +57,28 @@ def load_project_config(project_root: Path) -> dict[str, Any] | None:
         return None
 
 
+@functools.lru_cache(maxsize=32)
+def _load_project_config_at(path_str: str, mtime_ns: int, size: int) -> dict[str, Any] | None:
+    try:
+        data = load_minimal_yaml(Path(path_str).read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else None
+    except Exception:
+        return None
+
+
+def load_project_config_cached(project_root: Path) -> dict[str, Any] | None:
+    """
+    Like `load_project_config`, but memoized per file identity (path + mtime + size) for the process.
+    The returned dict is shared: callers must treat it as read-only.
+    """
+    cfg = project_root / ".claude" / "project.yaml"
+    try:
+        st = cfg.stat()
+    except OSError:
+        return None
+    return _load_project_config_at(str(cfg.resolve()), st.st_mtime_ns, st.st_size)
+
+
 def get_sessions_dir(project_root: Path, config: dict[str, Any] | None = None) -> str:
     """Get `workflow.sessions_dir` from config, default `.session`."""
     if config is None:
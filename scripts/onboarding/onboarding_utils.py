@@ -18,7 +18,7 @@ from pathlib import Path
 from typing import Any
 
 
-IGNORE_DIRS = {
+IGNORE_DIRS = frozenset({
     ".git",
     ".hg",
     ".svn",
@@ -36,7 +36,7 @@ IGNORE_DIRS = {
     "vendor",
     ".claude",
     ".session",
-}
+})
 
 
 
@@ -40,7 +40,7 @@ from lib.simple_yaml import load_minimal_yaml  # noqa: E402
 
 
 
-CODE_OWNERS = {"implementor", "tests-builder"}
+CODE_OWNERS = frozenset({"implementor", "tests-builder"})
 
 
 def _extract_compliance_decision(report_path: Path) -> str | None:
@@ -20,7 +20,7 @@ from typing import Any
 from lib.docs_registry import build_doc_id_to_path_map, get_docs_registry_path, get_docs_require_registry, load_docs_registry
 from lib.path_policy import forbid_globs_from_project_config, is_forbidden_path, normalize_repo_relative_posix_path
 from lib.project import detect_project_dir, load_project_config
-from docs.coverage_rules import evaluate_coverage_rules_for_write_scopes
+from docs.coverage_rules import evaluate_coverage_rules_for_write_scopes, precompile_coverage_rules
 
 
 @dataclass(frozen=True)
@@ -40,7 +40,7 @@ ALLOWED_OWNERS = {
     "reviewer",
     "ideation",
 }
-CODE_OWNERS = {"implementor", "tests-builder"}
+CODE_OWNERS = frozenset({"implementor", "tests-builder"})
 
 
 def _contains_glob_chars(value: str) -> bool:
@@ -166,6 +166,10 @@ def validate_actions_data(data: dict[str, Any], *, project_root: Path | None = N
     docs_map = build_doc_id_to_path_map(registry)
     if require_registry and not docs_map:
         errors.append(ValidationError("docs.registry_path", f"docs.require_registry=true but registry is missing/invalid: {registry_path!r}"))
+    # Hoisted once: an absent/empty rule list skips coverage evaluation for every task; otherwise the
+    # rule-only work (priority order, keyword phrases, cache token) is precompiled once for all tasks.
+    raw_rules = registry.get("coverage_rules") if isinstance(registry, dict) else None
+    coverage_rules = precompile_coverage_rules(raw_rules) if isinstance(raw_rules, list) and raw_rules else None
 
     for i, t in enumerate(tasks):
         tp = f"tasks[{i}]"
@@ -183,21 +187,24 @@ def validate_actions_data(data: dict[str, Any], *, project_root: Path | None = N
         task_by_id[tid] = t
 
         owner = t.get("owner")
+        is_code_task = owner in CODE_OWNERS
         if owner not in ALLOWED_OWNERS:
             errors.append(ValidationError(f"{tp}.owner", f"Must be one of {sorted(ALLOWED_OWNERS)}, got {owner!r}"))
 
         summary = t.get("summary")
         if not isinstance(summary, str) or not summary.strip():
             # Common mistake: using 'title'
-            if isinstance(t.get("title"), str) and t.get("title"):
+            if isinstance(title := t.get("title"), str) and title:
                 errors.append(ValidationError(tp, "Uses 'title' but schema requires 'summary'"))
             errors.append(ValidationError(f"{tp}.summary", "Required non-empty string"))
-        summary_text_for_keywords = summary.strip() if isinstance(summary, str) else ""
+        # Collect parts and join once (repeated `+=` would re-copy the accumulator per statement).
+        keyword_parts: list[str] = [summary.strip() if isinstance(summary, str) else ""]
         acs = t.get("acceptance_criteria")
         if isinstance(acs, list):
             for ac in acs[:50]:
-                if isinstance(ac, dict) and isinstance(ac.get("statement"), str) and ac.get("statement").strip():
-                    summary_text_for_keywords += "\n" + ac.get("statement").strip()
+                if isinstance(ac, dict) and isinstance(stmt := ac.get("statement"), str) and (stmt := stmt.strip()):
+                    keyword_parts.append(stmt)
+        summary_text_for_keywords = "\n".join(keyword_parts)
 
         file_scope = t.get("file_scope")
         if not _expect_type(errors, file_scope, dict, f"{tp}.file_scope"):
@@ -210,7 +217,7 @@ def validate_actions_data(data: dict[str, Any], *, project_root: Path | None = N
 
         # Code tasks need writes if parallel enabled.
         parsed_writes: list[WriteScope] = []
-        if owner in CODE_OWNERS and parallel_enabled:
+        if is_code_task and parallel_enabled:
             writes = file_scope.get("writes")
             if not isinstance(writes, list) or not writes:
                 errors.append(ValidationError(f"{tp}.file_scope.writes", "Required non-empty array for code tasks when parallel_execution.enabled=true"))
@@ -227,9 +234,11 @@ def validate_actions_data(data: dict[str, Any], *, project_root: Path | None = N
                 if not isinstance(ac, dict):
                     errors.append(ValidationError(ap, "Must be an object"))
                     continue
-                if not isinstance(ac.get("id"), str) or not str(ac.get("id")).strip():
+                ac_id = ac.get("id")
+                if not isinstance(ac_id, str) or not ac_id.strip():
                     errors.append(ValidationError(f"{ap}.id", "Required non-empty string"))
-                if not isinstance(ac.get("statement"), str) or not str(ac.get("statement")).strip():
+                ac_stmt = ac.get("statement")
+                if not isinstance(ac_stmt, str) or not ac_stmt.strip():
                     errors.append(ValidationError(f"{ap}.statement", "Required non-empty string"))
                 verifs = ac.get("verifications")
                 if isinstance(verifs, list) and any(isinstance(v, dict) for v in verifs):
@@ -308,7 +317,7 @@ def validate_actions_data(data: dict[str, Any], *, project_root: Path | None = N
 
             # Optional strictness: require at least one verification for code tasks.
             # This makes "done" evidence deterministic and improves self-healing (gates can prove failures).
-            if owner in CODE_OWNERS and require_verifications_for_code and not any_verifications:
+            if is_code_task and require_verifications_for_code and not any_verifications:
                 errors.append(
                     ValidationError(
                         f"{tp}.acceptance_criteria",
@@ -317,14 +326,14 @@ def validate_actions_data(data: dict[str, Any], *, project_root: Path | None = N
                 )
 
         # Optional strictness: require user-story linkage for code tasks.
-        if owner in CODE_OWNERS and require_user_stories:
+        if is_code_task and require_user_stories:
             us = t.get("user_story_ids")
-            ids = [str(x).strip() for x in us if isinstance(x, str) and str(x).strip()] if isinstance(us, list) else []
+            ids = [sid for x in us if isinstance(x, str) and (sid := x.strip())] if isinstance(us, list) else []
             if not ids:
                 errors.append(ValidationError(f"{tp}.user_story_ids", "workflow.require_user_stories=true but task is missing user_story_ids[] (non-empty)"))
 
         # Docs registry constraints (code tasks only).
-        if owner in CODE_OWNERS and require_registry:
+        if is_code_task and require_registry:
             ctx = t.get("context")
             if not isinstance(ctx, dict):
                 errors.append(ValidationError(f"{tp}.context", "Required object for code tasks when docs.require_registry=true"))
@@ -342,16 +351,16 @@ def validate_actions_data(data: dict[str, Any], *, project_root: Path | None = N
 
                 # Coverage rules enforcement (planning-time, deterministic):
                 # Ensure required_doc_ids for this task's planned write scopes are included in context.doc_ids[].
-                rules = registry.get("coverage_rules") if isinstance(registry, dict) else None
-                if isinstance(rules, list) and parsed_writes:
+                if coverage_rules and parsed_writes:
                     plan = evaluate_coverage_rules_for_write_scopes(
-                        rules,
+                        coverage_rules,
                         write_scopes=[w.raw for w in parsed_writes],
                         keywords_text=summary_text_for_keywords,
+                        use_cache=True,
                     )
                     required = plan.required_doc_ids
                     if required:
-                        doc_set = set([d.strip() for d in doc_ids if isinstance(d, str)]) if isinstance(doc_ids, list) else set()
+                        doc_set = {d.strip() for d in doc_ids if isinstance(d, str)} if isinstance(doc_ids, list) else set()
                         missing = [d for d in required if d not in doc_set]
                         if missing:
                             why: list[str] = []
@@ -546,7 +555,7 @@ def validate_actions_data(data: dict[str, Any], *, project_root: Path | None = N
 
 def validate_actions_file(path: Path, *, project_root: Path | None = None) -> list[ValidationError]:
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
     except FileNotFoundError:
         return [ValidationError(str(path), "File not found")]
     except json.JSONDecodeError as exc:
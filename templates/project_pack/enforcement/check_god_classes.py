@@ -11,14 +11,17 @@ from __future__ import annotations
 
 import argparse
 import ast
+import json
 import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 
-IGNORE_DIRS = {
+IGNORE_DIRS = frozenset({
     ".git",
     ".hg",
     ".svn",
@@ -36,7 +39,7 @@ IGNORE_DIRS = {
     "vendor",
     ".claude",
     ".session",
-}
+})
 
 
 @dataclass(frozen=True)
@@ -49,19 +52,37 @@ class Finding:
     end_line: int
 
 
-def _iter_python_files(project_root: Path, *, max_files: int = 50_000) -> list[Path]:
-    files: list[Path] = []
+def _iter_python_files(project_root: Path, *, ignore_dirs: frozenset[str] = IGNORE_DIRS, max_files: int = 50_000) -> list[str]:
+    """
+    Same traversal as a top-down `os.walk` (files of a directory, then its subdirectories in listing order),
+    but over `os.scandir` so entry types come from the directory listing instead of extra stats.
+    Returns plain path strings; callers build `Path` objects only where they need them.
+    """
+    files: list[str] = []
     scanned = 0
-    for root, dirs, fns in os.walk(project_root, topdown=True):
-        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS and not d.startswith(".git")]
-        for fn in fns:
-            scanned += 1
-            if max_files > 0 and scanned > max_files:
-                break
-            if fn.endswith(".py"):
-                files.append(Path(root) / fn)
-        if max_files > 0 and scanned > max_files:
-            break
+    stack = [str(project_root)]
+    while stack:
+        subdirs: list[str] = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    try:
+                        is_dir = e.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # Like os.walk(followlinks=False): symlinked dirs are neither files nor descended into.
+                        if e.name not in ignore_dirs and not e.name.startswith(".git") and not e.is_symlink():
+                            subdirs.append(e.path)
+                        continue
+                    scanned += 1
+                    if max_files > 0 and scanned > max_files:
+                        return files
+                    if e.name.endswith(".py"):
+                        files.append(e.path)
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
     return files
 
 
@@ -75,35 +96,182 @@ def _class_span(node: ast.ClassDef) -> tuple[int, int]:
     return (start, end)
 
 
+# Statement-list fields (in `_fields` order). Classes are statements, so following only these reaches every
+# ClassDef without visiting expression nodes.
+_STMT_LIST_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+
+def _iter_class_defs(tree: ast.Module) -> Iterator[ast.ClassDef]:
+    # Breadth-first like `ast.walk`, so findings keep the same order.
+    queue = deque(tree.body)
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, ast.ClassDef):
+            yield node
+        for field in _STMT_LIST_FIELDS:
+            children = getattr(node, field, None)
+            if isinstance(children, list):
+                queue.extend(children)
+
+
+def _parse_file(path_str: str, project_root_str: str, max_methods: int, max_lines: int) -> list[Finding]:
+    # Module-level (picklable) so it can run in worker processes.
+    path = Path(path_str)
+    rel = str(path.relative_to(project_root_str)).replace("\\", "/")
+    try:
+        data = path.read_bytes()
+        # Any class statement (top-level or indented) contains this token; files without it cannot produce findings.
+        if b"class" not in data:
+            return []
+        try:
+            # The tokenizer decodes bytes itself (honouring coding cookies), skipping a separate str decode.
+            tree = ast.parse(data)
+        except (SyntaxError, ValueError):
+            # Undecodable bytes: keep the old lenient behaviour of dropping them rather than the file.
+            tree = ast.parse(data.decode("utf-8", errors="ignore"))
+    except Exception:
+        return []
+
+    findings: list[Finding] = []
+    for node in _iter_class_defs(tree):
+        methods = _count_methods(node)
+        start, end = _class_span(node)
+        lines = max(0, (end - start + 1)) if start and end else 0
+        if methods >= max_methods or lines >= max_lines:
+            findings.append(Finding(path=rel, class_name=node.name, methods=methods, lines=lines, start_line=start, end_line=end))
+    return findings
+
+
+# Below this many files, worker start-up costs more than parsing serially.
+_PARALLEL_MIN_FILES = 50
+
+
+_CACHE_VERSION = 1
+
+
+def _load_cache(cache_path: Path, thresholds: list[int]) -> dict[str, Any]:
+    try:
+        data = json.loads(cache_path.read_bytes())
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION or data.get("thresholds") != thresholds:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _write_cache(cache_path: Path, thresholds: list[int], files: dict[str, Any]) -> None:
+    payload = {"version": _CACHE_VERSION, "thresholds": thresholds, "files": files}
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_name(cache_path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, cache_path)
+    except OSError:
+        pass
+
+
+def _parse_many(files: list[str], root_s: str, max_methods: int, max_lines: int) -> list[list[Finding]]:
+    n = len(files)
+    if n >= _PARALLEL_MIN_FILES and (os.cpu_count() or 1) > 1:
+        try:
+            with ProcessPoolExecutor() as ex:
+                return list(ex.map(_parse_file, files, [root_s] * n, [max_methods] * n, [max_lines] * n, chunksize=32))
+        except (OSError, NotImplementedError, RuntimeError):
+            # No usable multiprocessing here (sandboxed /dev/shm, frozen interpreter, ...): parse serially.
+            pass
+    return [_parse_file(path_s, root_s, max_methods, max_lines) for path_s in files]
+
+
+def _collect_findings(
+    project_root: Path,
+    *,
+    max_methods: int,
+    max_lines: int,
+    cache_path: Path | None = None,
+    ignore_dirs: frozenset[str] = IGNORE_DIRS,
+) -> list[Finding]:
+    files = _iter_python_files(project_root, ignore_dirs=ignore_dirs)
+    root_s = str(project_root)
+    if cache_path is None:
+        return [f for chunk in _parse_many(files, root_s, max_methods, max_lines) for f in chunk]
+
+    # Per-file findings are reused while the file's (mtime_ns, size) is unchanged; thresholds are part of the
+    # cache identity, so changing them starts a fresh cache.
+    thresholds = [max_methods, max_lines]
+    cached = _load_cache(cache_path, thresholds)
+    fresh: dict[str, Any] = {}
+    per_file: list[list[Finding] | None] = []
+    misses: list[int] = []
+    for i, path_s in enumerate(files):
+        rel = str(Path(path_s).relative_to(root_s)).replace("\\", "/")
+        try:
+            st = os.stat(path_s)
+        except OSError:
+            per_file.append([])
+            continue
+        key = f"{st.st_mtime_ns}:{st.st_size}"
+        entry = cached.get(rel)
+        if isinstance(entry, dict) and entry.get("key") == key and isinstance(entry.get("findings"), list):
+            try:
+                per_file.append([Finding(**f) for f in entry["findings"]])
+                fresh[rel] = entry
+                continue
+            except TypeError:
+                pass
+        per_file.append(None)
+        misses.append(i)
+        fresh[rel] = {"key": key}
+
+    for i, found in zip(misses, _parse_many([files[i] for i in misses], root_s, max_methods, max_lines)):
+        per_file[i] = found
+        rel = str(Path(files[i]).relative_to(root_s)).replace("\\", "/")
+        fresh[rel]["findings"] = [f.__dict__ for f in found]
+
+    if misses or fresh.keys() != cached.keys():
+        _write_cache(cache_path, thresholds, fresh)
+    return [f for found in per_file if found for f in found]
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Detect oversized Python classes (god-class heuristic).")
     parser.add_argument("--project-root", default=".")
     parser.add_argument("--max-methods", type=int, default=25)
     parser.add_argument("--max-lines", type=int, default=400)
     parser.add_argument("--json", dest="json_out", default=None, help="Write a JSON report to this path (optional)")
+    parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Reuse per-file results for files whose mtime/size are unchanged since the last cached run.",
+    )
+    parser.add_argument("--cache-path", default=".claude/at/.god_class_cache.json", help="Cache file (repo-relative or absolute)")
+    parser.add_argument(
+        "--ignore-dir",
+        action="append",
+        default=[],
+        help="Extra directory name to skip (repeatable), e.g. a custom sessions dir.",
+    )
     args = parser.parse_args()
 
     project_root = Path(args.project_root).resolve()
     max_methods = int(args.max_methods)
     max_lines = int(args.max_lines)
 
-    findings: list[Finding] = []
-    for path in _iter_python_files(project_root):
-        rel = str(path.relative_to(project_root)).replace("\\", "/")
-        try:
-            text = path.read_text(encoding="utf-8", errors="ignore")
-            tree = ast.parse(text)
-        except Exception:
-            continue
-
-        for node in ast.walk(tree):
-            if not isinstance(node, ast.ClassDef):
-                continue
-            methods = _count_methods(node)
-            start, end = _class_span(node)
-            lines = max(0, (end - start + 1)) if start and end else 0
-            if methods >= max_methods or lines >= max_lines:
-                findings.append(Finding(path=rel, class_name=node.name, methods=methods, lines=lines, start_line=start, end_line=end))
+    cache_path: Path | None = None
+    if args.cache:
+        cache_path = Path(args.cache_path)
+        if not cache_path.is_absolute():
+            cache_path = (project_root / cache_path).resolve()
+    # One frozenset for the whole walk; the per-directory check is a single hash lookup.
+    ignore_dirs = IGNORE_DIRS | frozenset(d.strip().strip("/") for d in args.ignore_dir if d.strip())
+    findings = _collect_findings(
+        project_root,
+        max_methods=max_methods,
+        max_lines=max_lines,
+        cache_path=cache_path,
+        ignore_dirs=ignore_dirs,
+    )
 
     ok = len(findings) == 0
     report: dict[str, Any] = {
@@ -119,7 +287,7 @@ def main() -> int:
         if not outp.is_absolute():
             outp = (project_root / outp).resolve()
         outp.parent.mkdir(parents=True, exist_ok=True)
-        outp.write_text(__import__("json").dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        outp.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
     if ok:
         print("OK: no god classes detected")